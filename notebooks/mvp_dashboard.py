@@ -1,8 +1,9 @@
 from pathlib import Path
 import pandas as pd
+import pyarrow as pa
 import matplotlib.pyplot as plt
 import seaborn as sns
-import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
 from io           import BytesIO
 from PIL          import Image
@@ -13,52 +14,96 @@ import requests
 # Config
 # ────────────────────────────────────
 DATA_DIR = Path(__file__).resolve().parents[1] / "data" / "processed"
-MVP_CSV = DATA_DIR / "mvp_cleaned.csv"
-TEAM_DATA = DATA_DIR / "teams_cleaned.csv"
-PLAYERS_CSV = DATA_DIR / "player_bios_cleaned.csv"
-ERA_BINS = [0, 1979, 1989, 1999, 2009, 3000]
-ERA_LABELS = [
-    "Early Years (≤1979)",
-    "Magic-Bird Era (1980s)",
-    "Jordan Era (1990s)",
-    "Post-Jordan (2000s)",
-    "Modern Era (2010-present)",
-]
+MVP_JOINED = DATA_DIR / "mvp_joined.parquet"     # built by scripts/clean/build_mvp_joined.py
+# dictionary-encoded Arrow strings for the low-cardinality labels we group on
+LABEL_DTYPE = pd.ArrowDtype(pa.dictionary(pa.int32(), pa.string()))
 
 # ────────────────────────────────────
-# Data loading & preprocessing
+# Data loading
 # ────────────────────────────────────
 @st.cache_data
 def load_data():
-    mvp = pd.read_csv(MVP_CSV)
-    if "season_start" not in mvp.columns:
-        mvp["season_start"] = mvp["season"].str[:4].astype(int)
-    if "season_end" not in mvp.columns:
-        mvp["season_end"] = mvp["season_start"] + 1
-
-    players = pd.read_csv(PLAYERS_CSV, parse_dates=["birthdate"])
-    players["position_primary"] = players["position"].str.split("-").str[0]
-
-    teams = pd.read_csv(TEAM_DATA)
-    
-
-    df = (
-        mvp
-          # add player‐level info
-          .merge(
-             players[["player","position_primary","height","weight","birthdate","headshot_url"]],
-             on="player", how="left"
-          )
-          # add team_id
-          .merge(
-             teams[["team_name", "team","team_id", "logo_url"]],
-             on="team", how="left"
-          )
-    )
-    df["age"] = df["season_start"] - df["birthdate"].dt.year
-    df["era"] = pd.cut(df["season_start"], bins=ERA_BINS, labels=ERA_LABELS)
+    df = pd.read_parquet(MVP_JOINED)
+    for col in ("player", "team", "position_primary"):
+        df[col] = df[col].astype(LABEL_DTYPE)
     return df
 
+
+def filter_mvps(df: pd.DataFrame, year_range, eras) -> pd.DataFrame:
+    mask = df["season_start"].between(year_range[0], year_range[1]) & df["era"].isin(eras)
+    return df[mask]
+
+
+@st.cache_data
+def compute_kpis(year_range: tuple, eras: tuple) -> dict:
+    """KPIs for one filter selection; memoised on the (hashable) filter values."""
+    filtered = filter_mvps(load_data(), year_range, eras)
+    total_mvp = len(filtered)
+    career_counts = filtered.groupby("player")["season_start"].count()
+    first_time = career_counts[career_counts == 1].sum()
+    young_row = filtered.loc[filtered["age"].idxmin()]
+    old_row = filtered.loc[filtered["age"].idxmax()]
+    return dict(
+        total_mvp=total_mvp,
+        unique_winners=filtered["player"].nunique(),
+        repeat_share=career_counts[career_counts >= 2].sum() / total_mvp * 100 if total_mvp else 0,
+        first_time=first_time,
+        first_share=first_time / total_mvp * 100 if total_mvp else 0,
+        avg_age=filtered["age"].mean(),
+        min_age=young_row["age"],
+        youngest_name=young_row["player"],
+        young_year=young_row["season_end"],
+        max_age=old_row["age"],
+        oldest_name=old_row["player"],
+        old_year=old_row["season_end"],
+        pos_counts=filtered["position_primary"].fillna("Unknown").value_counts(),
+        # Advanced stats
+        avg_pts=filtered["pts"].mean(),
+        avg_trb=filtered["trb"].mean(),
+        avg_ast=filtered["ast"].mean(),
+        avg_stl=filtered["stl"].mean(),
+        avg_blk=filtered["blk"].mean(),
+        avg_fgpct=filtered["fg_pct"].mean()*100,
+        avg_ws=filtered["ws"].mean(),
+        avg_ws48=filtered["ws_48"].mean(),
+    )
+
+
+# ────────────────────────────────────
+# Chart builders (go.* from NumPy arrays; memoised like the KPIs)
+# ────────────────────────────────────
+@st.cache_data
+def position_figure(year_range: tuple, eras: tuple) -> go.Figure:
+    pos = compute_kpis(year_range, eras)["pos_counts"].sort_values(ascending=True)
+    counts = pos.to_numpy()
+    fig = go.Figure(go.Bar(y=pos.index.to_numpy(), x=counts, text=counts, orientation="h"))
+    fig.update_layout(xaxis_title="MVP Count", yaxis_title="Position")
+    return fig
+
+
+@st.cache_data
+def top_teams_figure(year_range: tuple, eras: tuple) -> go.Figure:
+    top = filter_mvps(load_data(), year_range, eras)["team"].value_counts().nlargest(10)
+    counts = top.to_numpy()
+    fig = go.Figure(go.Bar(x=top.index.to_numpy(), y=counts, text=counts))
+    fig.update_layout(xaxis_title="Team", yaxis_title="Count")
+    return fig
+
+
+@st.cache_data
+def age_figure(year_range: tuple, eras: tuple) -> go.Figure:
+    filtered = filter_mvps(load_data(), year_range, eras)
+    age_season_df = filtered[["season_end", "age"]].drop_duplicates().sort_values("season_end")
+    fig = go.Figure(go.Scatter(
+        x=age_season_df["season_end"].to_numpy(),
+        y=age_season_df["age"].to_numpy(),
+        mode="lines",
+    ))
+    fig.update_traces(marker=dict(size=10, color='steelblue'))
+    fig.update_layout(title="Age per Season", xaxis_title="Year", yaxis_title="Age of MVP Winner")
+    return fig
+
+
 # Streamlit layout & filters
 st.set_page_config(page_title="NBA MVP Dashboard", layout="wide")
 hide_streamlit_style = "<style>#MainMenu {visibility: hidden;} footer {visibility: hidden;}</style>"
@@ -69,40 +114,15 @@ max_year = int(df["season_start"].max())
 year_range = st.sidebar.slider(
     "Season end range", min_year, max_year, (max_year-19, max_year)
 )
-era_filter = st.sidebar.multiselect("Select Eras", options=ERA_LABELS, default=ERA_LABELS)
-filtered = df.query(
-    "@year_range[0] <= season_start <= @year_range[1] and era in @era_filter"
-)
+era_labels = list(df["era"].cat.categories)
+era_filter = st.sidebar.multiselect("Select Eras", options=era_labels, default=era_labels)
+filtered = filter_mvps(df, year_range, era_filter)
 
 # ────────────────────────────────────
 # Compute KPIs
 # ────────────────────────────────────
-total_mvp = len(filtered)
-unique_winners = filtered["player"].nunique()
-career_counts = filtered.groupby("player")["season_start"].count()
-repeat_share = career_counts[career_counts >= 2].sum() / total_mvp * 100 if total_mvp else 0
-first_time = career_counts[career_counts == 1].sum()
-first_share = first_time / total_mvp * 100 if total_mvp else 0
-avg_age = filtered["age"].mean()
-min_age = filtered["age"].min()
-max_age = filtered["age"].max()
-young_row = filtered.loc[filtered["age"] == min_age].iloc[0]
-youngest_name = young_row["player"]
-young_year = young_row["season_end"]
-old_row = filtered.loc[filtered["age"] == max_age].iloc[0]
-oldest_name = old_row["player"]
-old_year = old_row["season_end"]
-pos_counts = filtered["position_primary"].fillna("Unknown").value_counts()
-g,f,c = pos_counts.get("G",0), pos_counts.get("F",0), pos_counts.get("C",0)
-# Advanced stats
-avg_pts = filtered["pts"].mean()
-avg_trb = filtered["trb"].mean()
-avg_ast = filtered["ast"].mean()
-avg_stl = filtered["stl"].mean()
-avg_blk = filtered["blk"].mean()
-avg_fgpct = filtered["fg_pct"].mean()*100
-avg_ws = filtered["ws"].mean()
-avg_ws48 = filtered["ws_48"].mean()
+filter_key = (tuple(year_range), tuple(sorted(era_filter)))
+kpi = compute_kpis(*filter_key)
 
 # ────────────────────────────────────
 # Header & Volume KPIs
@@ -112,18 +132,18 @@ st.markdown(
     unsafe_allow_html=True
 )
 c1, c2, c3, c4 = st.columns(4)
-c1.metric("Seasons", total_mvp)
-c2.metric("Unique Winners", unique_winners)
-c3.metric("Repeat-win %", f"{repeat_share:.1f}%")
-c4.metric("1st-time wins", f"{first_time} ({first_share:.1f}% ) ")
+c1.metric("Seasons", kpi["total_mvp"])
+c2.metric("Unique Winners", kpi["unique_winners"])
+c3.metric("Repeat-win %", f"{kpi['repeat_share']:.1f}%")
+c4.metric("1st-time wins", f"{kpi['first_time']} ({kpi['first_share']:.1f}% ) ")
 
 # ────────────────────────────────────
 # Age KPIs including per-year selection
 # ────────────────────────────────────
 c5, c6, c7= st.columns([1,2,2])
-c5.metric("Avg Age", f"{avg_age:.1f} yrs")
-c6.metric("Youngest Winner", f"{youngest_name} ({min_age:.0f} yrs, {young_year})")
-c7.metric("Oldest Winner",   f"{oldest_name}   ({max_age:.0f} yrs, {old_year})")
+c5.metric("Avg Age", f"{kpi['avg_age']:.1f} yrs")
+c6.metric("Youngest Winner", f"{kpi['youngest_name']} ({kpi['min_age']:.0f} yrs, {kpi['young_year']})")
+c7.metric("Oldest Winner",   f"{kpi['oldest_name']}   ({kpi['max_age']:.0f} yrs, {kpi['old_year']})")
 
 
 st.markdown(
@@ -175,22 +195,10 @@ st.markdown("---")
 chart_col1, chart_col2 = st.columns([1,3])
 with chart_col1:
     st.subheader("MVPs by Position")
-    pos_df = pos_counts.reset_index()
-    pos_df.columns = ["Position", "MVP Count"]
-    pos_df = pos_df.sort_values("MVP Count", ascending=True)
-    fig_pos = px.bar(
-        pos_df, 
-        y="Position", 
-        x="MVP Count",
-        text="MVP Count",
-        orientation="h",
-    )
-    st.plotly_chart(fig_pos, use_container_width=True)
+    st.plotly_chart(position_figure(*filter_key), use_container_width=True)
 with chart_col2:
     st.subheader("Top Teams")
-    tdf = filtered["team"].value_counts().nlargest(10).reset_index()
-    tdf.columns=["Team","Count"]
-    st.plotly_chart(px.bar(tdf,x="Team",y="Count",text="Count"),use_container_width=True)
+    st.plotly_chart(top_teams_figure(*filter_key), use_container_width=True)
 
 
 st.markdown("---")
@@ -201,11 +209,7 @@ st.markdown("---")
 chart_col3, chart_col4, chart_col5= st.columns([1,1,1])
 with chart_col3:
     st.subheader("Age vs Season")
-    age_season_df = filtered[["season_end", "age"]].drop_duplicates().sort_values("season_end")
-    fig = px.line(age_season_df, x="season_end", y="age", title="Age per Season")
-    fig.update_traces(marker=dict(size=10, color='steelblue'))
-    fig.update_layout(xaxis_title="Year", yaxis_title="Age of MVP Winner")
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(age_figure(*filter_key), use_container_width=True)
 
 
 
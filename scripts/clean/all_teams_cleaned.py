@@ -6,10 +6,18 @@ Usage
   python scripts/clean_teams.py --merge    # merge teams_detailed.csv if present
 """
 import os
+import sys
 import argparse
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+
+from utils.clean_helpers import read_raw_csv  # noqa: E402
+
 RAW_DIR   = "data/raw"
 OUT_FPATH = "data/processed/teams_cleaned.csv"
 
@@ -17,7 +25,10 @@ OUT_FPATH = "data/processed/teams_cleaned.csv"
 # ────────────────────────────── helpers ────────────────────────────────
 def _load(name: str) -> pd.DataFrame:
     p = os.path.join(RAW_DIR, name)
-    return pd.read_csv(p) if os.path.exists(p) else pd.DataFrame()
+    if not os.path.exists(p):
+        return pd.DataFrame()
+    # Arrow parses blocks on all cores, with pandas' NA handling ("" / "NA" → NaN)
+    return read_raw_csv(p)
 
 
 def _clean_cols(df: pd.DataFrame) -> pd.DataFrame:
@@ -60,9 +71,10 @@ def main(merge: bool):
     df = df.drop(columns="state", errors="ignore")
 
     # ── tidy text fields ────────────────────────────────────────────────
-    df["team_name"]  = df["team_name"].astype(str).str.strip()
-    df["nickname"]   = df["nickname"].fillna("").astype(str).str.strip()
-    df["short_code"] = df["short_code"].fillna("").astype(str).str.upper()
+    text_cols = ["team_name", "nickname", "short_code"]
+    text = df[text_cols].astype("string[pyarrow]")          # one cast for all three
+    df = df.assign(**{c: text[c].str.strip().fillna("") for c in text_cols})
+    df["short_code"] = df["short_code"].str.upper()
 
     if "short_code" in df.columns:
         df.rename(columns={"short_code": "team"}, inplace=True)
@@ -101,6 +113,10 @@ def main(merge: bool):
     # ── save ────────────────────────────────────────────────────────────
     os.makedirs(os.path.dirname(OUT_FPATH), exist_ok=True)
     df.to_csv(OUT_FPATH, index=False)
+    df.to_parquet(
+        os.path.splitext(OUT_FPATH)[0] + ".parquet",
+        engine="pyarrow", compression="zstd", index=False,
+    )
     print(f"✅ saved → {OUT_FPATH}  ({len(df):,} rows)")
 
 
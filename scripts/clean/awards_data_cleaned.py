@@ -16,6 +16,8 @@ import sys
 import re
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
 # ── PROJECT ROOT & IMPORT HELPERS ────────────────────────────────────────────
 ROOT = Path(__file__).resolve().parents[2]
@@ -23,38 +25,56 @@ sys.path.append(str(ROOT))
 # Ensure utils package is recognized
 (ROOT / "utils" / "__init__.py").touch(exist_ok=True)
 
-from utils.clean_helpers import normalise_cols
+from utils.clean_helpers import (
+    ensure_dir, normalise_cols, processed_path, season_start_year,
+    write_processed,
+)
+from utils.numeric_helpers import coerce_all_numeric
 
 # ── RAW / PROCESSED DIRECTORIES ─────────────────────────────────────────────
 RAW_DIR  = ROOT / "data" / "raw" / "awards"
 PROC_DIR = ROOT / "data" / "processed" / "awards"
 
-# Ensure the processed/awards directory exists
-PROC_DIR.mkdir(parents=True, exist_ok=True)
+# Extra-player columns pandas names "Unnamed: N"
+_UNNAMED_RE = re.compile(r"^unnamed:\s*\d+$", flags=re.IGNORECASE)
 
 
-def clean_award_csv(input_path: Path, output_path: Path, award_name: str) -> None:
+def _read_text_csv(input_path: Path) -> pd.DataFrame:
     """
-    1. Read a single raw award CSV (input_path)
-    2. Normalize & rename columns
-    3. Detect any “Unnamed: …” columns and melt them into a single 'player' column
-    4. Add an "award" column (award_name)
-    5. Convert numeric columns (excluding award, player, etc.)
-    6. Split 'season' into season_start/season_end
-    7. Tidy text fields (team, player)
-    8. Drop exact duplicates
-    9. Write cleaned CSV to output_path
+    Read a CSV with every column as text using Arrow's multi-threaded parser.
+    Falls back to pandas when the header has blank or duplicate names, which
+    pandas turns into "Unnamed: N" / "col.1" and the melt logic relies on.
     """
+    try:
+        names = pacsv.open_csv(input_path).schema.names
+        if "" in names or len(set(names)) != len(names):
+            raise pa.ArrowInvalid("header needs pandas' column mangling")
+        table = pacsv.read_csv(
+            input_path,
+            convert_options=pacsv.ConvertOptions(
+                column_types={name: pa.string() for name in names},
+                strings_can_be_null=True,
+            ),
+        )
+        return table.to_pandas()
+    except pa.ArrowInvalid:
+        return pd.read_csv(input_path, dtype=str)
 
-    # ── 1) CHECK INPUT ────────────────────────────────────────────────────────
+
+def _read_award_csv(input_path: Path, *, header_only: bool = False) -> pd.DataFrame:
+    """
+    Load one raw award CSV (all columns as text) and normalise/rename its columns.
+    With header_only=True only the (renamed) header is read – an empty frame.
+    """
     if not input_path.exists() or not input_path.is_file():
         raise FileNotFoundError(f"Input CSV not found: {input_path}")
 
-    # ── 2) LOAD ───────────────────────────────────────────────────────────────
-    df = pd.read_csv(input_path)
-    print(f"\n📥 Loaded {len(df)} rows from '{input_path.name}'.")
+    if header_only:
+        df = pd.read_csv(input_path, dtype=str, nrows=0)
+    else:
+        df = _read_text_csv(input_path)
+        print(f"\n📥 Loaded {len(df)} rows from '{input_path.name}'.")
 
-    # ── 3) NORMALIZE & RENAME EXISTING COLUMNS ─────────────────────────────────
     df.columns = normalise_cols(df.columns)
 
     # Rename 'tm' → 'team' if present
@@ -66,12 +86,30 @@ def clean_award_csv(input_path: Path, output_path: Path, award_name: str) -> Non
         df.rename(columns={"9999": "player_id"}, inplace=True)
 
     # Drop any unwanted columns like 'voting' if present
-    df = df.drop(columns={"voting"}, errors="ignore")
+    return df.drop(columns={"voting"}, errors="ignore")
 
-    # ── 4) HANDLE MULTIPLE “Unnamed: …” COLUMNS ───────────────────────────────
+
+def tidy_award_frame(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """
+    Clean a frame of one or more award tables that share a schema. Each row
+    must already carry its award name in an 'award' column. Returns one
+    cleaned frame per award, in order of first appearance.
+
+    1. Detect any “Unnamed: …” columns and melt them into a single 'player' column
+    2. Move 'award' to the end (same layout as a single-file clean)
+    3. Split 'season' into season_start/season_end
+    4. Tidy text fields (team, player)
+    5. Per award: convert numeric columns (excluding award, player, etc.)
+    6. Per award: drop exact duplicates
+
+    Steps 5–6 run on each award's rows alone, so a blank in one file cannot
+    widen another file's int column to float.
+    """
+    awards = list(df["award"].unique())
+
+    # ── 1) HANDLE MULTIPLE “Unnamed: …” COLUMNS ───────────────────────────────
     # Find all columns whose name matches r"^unnamed:\s*\d+$" (case‐insensitive).
-    unnamed_pattern = re.compile(r"^unnamed:\s*\d+$", flags=re.IGNORECASE)
-    unnamed_cols = [c for c in df.columns if unnamed_pattern.match(c)]
+    unnamed_cols = [c for c in df.columns if _UNNAMED_RE.match(c)]
 
     if unnamed_cols:
         print(f"🔍 Found {len(unnamed_cols)} Unnamed player‐columns: {unnamed_cols}")
@@ -99,42 +137,53 @@ def clean_award_csv(input_path: Path, output_path: Path, award_name: str) -> Non
             # It's possible the CSV is already single-player-per-row. We trust that.
             print("ℹ️ No 'player' column found and no Unnamed columns. Leaving as-is.")
 
-    # ── 5) ADD AWARD NAME COLUMN ───────────────────────────────────────────────
-    df["award"] = award_name
-
-    # ── 6) NUMERIC CONVERSION ─────────────────────────────────────────────────
-    # Treat the following as text, never coerce to numeric:
-    text_cols = ["season", "lg", "player", "team", "player_id", "award"]
-    existing_text_cols = [c for c in text_cols if c in df.columns]
-    numeric_cols = df.columns.difference(existing_text_cols)
-
-    # Convert all other columns to numeric (NaN if not parseable)
-    df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce")
-    print(f"🔢 Converted to numeric (excluding text cols): {list(numeric_cols)}")
+    # ── 2) AWARD NAME COLUMN LAST ─────────────────────────────────────────────
+    df["award"] = df.pop("award")
 
-    # ── 7) SPLIT 'season' ─────────────────────────────────────────────────────
+    # ── 3) SPLIT 'season' ─────────────────────────────────────────────────────
     if "season" in df.columns:
         # Handle "YYYY-YY" or "YYYY–YY" (en dash) by extracting the first 4 digits
-        df["season_start"] = df["season"].str.extract(r"^(\d{4})", expand=False).astype(int)
+        df["season_start"] = season_start_year(df["season"]).astype("Int64")
         df["season_end"] = df["season_start"] + 1
     else:
         print("⚠️ 'season' column missing; skipping season_start/season_end.")
 
-    # ── 8) TIDY TEXT FIELDS ────────────────────────────────────────────────────
+    # ── 4) TIDY TEXT FIELDS ────────────────────────────────────────────────────
     if "team" in df.columns:
         df["team"] = df["team"].fillna("").str.strip().replace("", "FA")
     if "player" in df.columns:
         df["player"] = df["player"].str.strip()
 
-    # ── 9) DROP EXACT DUPLICATES ───────────────────────────────────────────────
-    before = len(df)
-    df = df.drop_duplicates()
-    dropped = before - len(df)
-    print(f"🗑️ Dropped {dropped} exact duplicate rows (if any). Total now: {len(df)}.")
-
-    # ── 10) SAVE CLEANED CSV ───────────────────────────────────────────────────
+    # Treat the following as text, never coerce to numeric:
+    text_cols = ["season", "lg", "player", "team", "player_id", "award"]
+    existing_text_cols = [c for c in text_cols if c in df.columns]
+    numeric_cols = df.columns.difference(existing_text_cols + ["season_start", "season_end"])
+    print(f"🔢 Converting to numeric (excluding text cols): {list(numeric_cols)}")
+
+    parts = dict(tuple(df.groupby("award", sort=False)))
+    out = {}
+    for award in awards:
+        # an award whose rows all melted away still gets its (empty) table
+        part = parts.get(award, df.iloc[:0]).copy()
+
+        # ── 5) NUMERIC CONVERSION ─────────────────────────────────────────────
+        # Convert all other columns to numeric (NaN if not parseable)
+        part = coerce_all_numeric(part, existing_text_cols)
+
+        # ── 6) DROP EXACT DUPLICATES ───────────────────────────────────────────
+        before = len(part)
+        part = part.drop_duplicates()
+        dropped = before - len(part)
+        print(f"🗑️ {award}: dropped {dropped} exact duplicate rows (if any). Total now: {len(part)}.")
+        out[award] = part
+    return out
+
+
+def _save_award_csv(df: pd.DataFrame, output_path: Path) -> None:
+    output_path = processed_path(output_path)   # .csv or .parquet (PROCESSED_FORMAT)
+    ensure_dir(output_path.parent)
     try:
-        df.to_csv(output_path, index=False)
+        write_processed(df, output_path)
         print(f"✅ Saved cleaned data to: {output_path.name}")
     except PermissionError as e:
         raise PermissionError(
@@ -142,13 +191,28 @@ def clean_award_csv(input_path: Path, output_path: Path, award_name: str) -> Non
         ) from e
 
 
-if __name__ == "__main__":
-    # ── LOOP OVER EVERY CSV IN RAW_DIR ────────────────────────────────────────
-    csv_files = sorted(RAW_DIR.glob("*.csv"))
+def clean_award_csv(input_path: Path, output_path: Path, award_name: str) -> None:
+    """
+    Clean a single raw award CSV (input_path) and write it to output_path.
+    Same steps as clean_all_awards, for one file.
+    """
+    df = _read_award_csv(input_path)
+    df["award"] = award_name
+    _save_award_csv(tidy_award_frame(df)[award_name], output_path)
+
+
+def clean_all_awards(raw_dir: Path = RAW_DIR, proc_dir: Path = PROC_DIR) -> None:
+    """Clean every award CSV in raw_dir into proc_dir/<stem>_cleaned.csv."""
+    # ── COLLECT EVERY CSV IN RAW_DIR ──────────────────────────────────────────
+    csv_files = sorted(raw_dir.glob("*.csv"))
     if not csv_files:
-        print(f"⚠️ No CSV files found in {RAW_DIR}. Nothing to clean.")
-        sys.exit(0)
+        print(f"⚠️ No CSV files found in {raw_dir}. Nothing to clean.")
+        return
 
+    # Files with the same (normalised) header are cleaned in one concatenated
+    # pass and split back out by award afterwards. Only headers are read to
+    # form the groups, so at most one group's rows are in memory at a time.
+    schema_groups: dict[tuple, list[Path]] = {}
     for input_path in csv_files:
         stem = input_path.stem.lower()
 
@@ -159,16 +223,22 @@ if __name__ == "__main__":
             print(f"⚠️ Skipping all_*teams file: '{input_path.name}'")
             continue
 
+        schema = tuple(_read_award_csv(input_path, header_only=True).columns)
+        schema_groups.setdefault(schema, []).append(input_path)
+
+    for paths in schema_groups.values():
         # Derive award_name from the filename stem (e.g. "roty", "mvp", etc.)
-        award_name = stem
+        stems = [p.stem.lower() for p in paths]
+        frames = [_read_award_csv(p).assign(award=stem) for p, stem in zip(paths, stems)]
+
+        print(f"\n🔄 Cleaning {', '.join(stems)}")
+        parts = tidy_award_frame(pd.concat(frames, ignore_index=True))
+        del frames
 
         # Output filename: "<stem>_cleaned.csv"
-        output_name = f"{stem}_cleaned.csv"
-        output_path = PROC_DIR / output_name
-
-        print(f"\n🔄 Cleaning '{input_path.name}' → '{output_name}' (award='{award_name}')")
-        clean_award_csv(
-            input_path=input_path,
-            output_path=output_path,
-            award_name=award_name
-        )
+        for stem in stems:
+            _save_award_csv(parts[stem], proc_dir / f"{stem}_cleaned.csv")
+
+
+if __name__ == "__main__":
+    clean_all_awards()
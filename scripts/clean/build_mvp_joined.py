@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Join the cleaned MVP table with roster + franchise info and write
+data/processed/mvp_joined.parquet (the table the MVP dashboard loads).
+
+Everything here is deterministic from the cleaned files, so run it once
+after the cleaners instead of redoing the merges on every dashboard start:
+
+    python scripts/clean/clean_mvp.py
+    python scripts/clean/players_bios_cleaned.py
+    python scripts/clean/all_teams_cleaned.py
+    python scripts/clean/build_mvp_joined.py
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+
+from utils.clean_helpers import read_newest_copy
+
+DATA_DIR    = ROOT / "data" / "processed"
+MVP_CSV     = DATA_DIR / "mvp_cleaned.csv"
+PLAYERS_CSV = DATA_DIR / "player_bios_cleaned.csv"
+TEAMS_CSV   = DATA_DIR / "teams_cleaned.csv"
+OUT_PATH    = DATA_DIR / "mvp_joined.parquet"
+
+ERA_BINS = [0, 1979, 1989, 1999, 2009, 3000]
+ERA_LABELS = [
+    "Early Years (≤1979)",
+    "Magic-Bird Era (1980s)",
+    "Jordan Era (1990s)",
+    "Post-Jordan (2000s)",
+    "Modern Era (2010-present)",
+]
+
+
+def build_mvp_joined() -> pd.DataFrame:
+    mvp = read_newest_copy(MVP_CSV)
+    if "season_start" not in mvp.columns:
+        mvp["season_start"] = mvp["season"].str[:4].astype(int)
+    if "season_end" not in mvp.columns:
+        mvp["season_end"] = mvp["season_start"] + 1
+
+    players = read_newest_copy(
+        PLAYERS_CSV,
+        ["player", "position", "height", "weight", "birthdate", "headshot_url"],
+        parse_dates=["birthdate"],
+    )
+    players["position_primary"] = players["position"].str.split("-").str[0]
+
+    teams = read_newest_copy(TEAMS_CSV, ["team_name", "team", "team_id", "logo_url"])
+
+    df = (
+        mvp
+          # add player‐level info
+          .merge(
+             players[["player","position_primary","height","weight","birthdate","headshot_url"]],
+             on="player", how="left"
+          )
+          # add team_id
+          .merge(
+             teams[["team_name", "team","team_id", "logo_url"]],
+             on="team", how="left"
+          )
+    )
+    df["age"] = df["season_start"] - df["birthdate"].dt.year
+    # ordered categorical (int8 codes) → stored dictionary-encoded, filtered on its codes
+    df["era"] = pd.cut(df["season_start"], bins=ERA_BINS, labels=ERA_LABELS, ordered=True)
+    return df
+
+
+def main(output_path: Path = OUT_PATH) -> None:
+    df = build_mvp_joined()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(output_path, engine="pyarrow", compression="zstd", index=False)
+    print(f"✅ saved → {output_path}  ({len(df):,} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,16 +12,21 @@ import pandas as pd
 ROOT = Path(__file__).resolve().parents[2]
 sys.path.append(str(ROOT))
 
-from utils.clean_helpers import normalise_cols   # noqa: E402
+from utils.clean_helpers import (  # noqa: E402
+    normalise_cols, processed_path, read_raw_csv, season_start_year,
+    write_processed,
+)
+from utils.numeric_helpers import coerce_all_numeric  # noqa: E402
 
 
 RAW_CSV  = ROOT / "data" / "raw"       / "mvp_raw.csv"
 CLEAN_CSV = ROOT / "data" / "processed" / "mvp_cleaned.csv"
 
 
+
 def clean_mvp_csv(input_path: Path = RAW_CSV, output_path: Path = CLEAN_CSV) -> None:
     # ── load ───────────────────────────────────────────────────────────────
-    df = pd.read_csv(input_path)
+    df = read_raw_csv(input_path)
 
     # ── normalise / rename columns ─────────────────────────────────────────
     df.columns = normalise_cols(df.columns)        # snake_case
@@ -32,11 +37,10 @@ def clean_mvp_csv(input_path: Path = RAW_CSV, output_path: Path = CLEAN_CSV) ->
 
     # ── numeric conversion (everything except identifiers / labels) ───────
     text_cols = ["season", "lg", "player", "team", "player_id"]
-    numeric_cols = df.columns.difference(text_cols)
-    df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce")
+    df = coerce_all_numeric(df, text_cols)
 
     # ── season_start / season_end ──────────────────────────────────────────
-    df["season_start"] = df["season"].str[:4].astype(int)
+    df["season_start"] = season_start_year(df["season"]).astype("Int64")
     df["season_end"]   = df["season_start"] + 1      # ← simple, bullet-proof
 
     # ── tidy player / team fields ──────────────────────────────────────────
@@ -47,8 +51,9 @@ def clean_mvp_csv(input_path: Path = RAW_CSV, output_path: Path = CLEAN_CSV) ->
     df = df.drop_duplicates()
 
     # ── save ───────────────────────────────────────────────────────────────
+    output_path = processed_path(output_path)     # .csv or .parquet (PROCESSED_FORMAT)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_path, index=False)
+    write_processed(df, output_path)
     print(f"✅ Cleaned MVP data saved to: {output_path}")
 
 
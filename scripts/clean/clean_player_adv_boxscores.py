@@ -26,6 +26,9 @@ data/processed/player_stats/adv_box_scores/<season>/
 
 Nothing is concatenated: every copy keeps exactly the rows for that team.
 
+With PROCESSED_FORMAT=parquet the team copies of each file are one
+hive-partitioned dataset instead: teams/<file-stem>/team=<TEAM>/part-0.parquet
+
 Cleaning steps
 --------------
 1. Normalise column names               (utils.clean_helpers.normalise_cols)
@@ -47,113 +50,144 @@ CLI
 from __future__ import annotations
 
 import argparse
+import os
 import pathlib
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Iterable, List
 
 import pandas as pd
 
 ROOT = pathlib.Path(__file__).resolve().parents[2]
+ROOT_STR = str(ROOT) + os.sep         # log paths relative to the repo root
 sys.path.append(str(ROOT))
 
-from utils.clean_helpers import normalise_cols          # type: ignore
-from utils.numeric_helpers import coerce_all_numeric    # type: ignore
+from utils.clean_helpers import (  # type: ignore
+    PROCESSED_FORMAT, SEASON_BOUNDS, WRITE_THREADS, add_season_bounds, csv_files,
+    dedupe_raw_rows, normalise_cols, processed_path, read_processed_columns,
+    split_copies, standardise_team_abbrev, subdir_names, up_to_date,
+    write_partitioned, write_table,
+)
+from utils.numeric_helpers import coerce_all_numeric, downcast_ints    # type: ignore
 
 RAW_ROOT  = ROOT / "data/raw/player_stats/adv_boxscores"
 PROC_ROOT = ROOT / "data/processed/player_stats/adv_boxscores"
 
-
-# ── column helpers ──────────────────────────────────────────────────────────
-def _standardise_team_abbrev(df: pd.DataFrame) -> None:
-    """Rename team_abbreviation → team and force upper-case."""
-    if "team_abbreviation" in df.columns:
-        df.rename(columns={"team_abbreviation": "team"}, inplace=True)
-    if "team" in df.columns:
-        df["team"] = df["team"].fillna("").astype(str).str.upper()
-
-
-def _add_season_bounds(df: pd.DataFrame) -> None:
-    """Add numeric season_start / season_end based on season string."""
-    if "season_year" in df.columns:
-        df.rename(columns={"season_year": "season"}, inplace=True)
-    if "season" in df.columns:
-        start = df["season"].astype(str).str.extract(r"^(\d{4})", expand=False)
-        df["season_start"] = pd.to_numeric(start, errors="coerce")
-        df["season_end"]   = df["season_start"] + 1
+# raw (pre-normalise) text columns: declared up front so the parser does
+# not have to infer them; the stat columns are left to come through numeric
+_TEXT_DTYPES = {c: str for c in (
+    "PLAYER_NAME", "NICKNAME", "TEAM_ABBREVIATION", "MATCHUP", "GAME_DATE", "WL", "SEASON_YEAR",
+)}
 
 
-# ── I/O helper ──────────────────────────────────────────────────────────────
-def _write_csv(path: pathlib.Path, df: pd.DataFrame, *, force: bool) -> None:
-    if path.exists() and not force:
+def _team_copies(master: pathlib.Path, team_root: pathlib.Path) -> list[pathlib.Path]:
+    """The per-team copies the cleaned file `master` should have."""
+    keys = read_processed_columns(master, ["team"])
+    if "team" not in keys.columns:
+        return []
+    base_name = master.with_suffix(".csv").name
+    return split_copies(keys["team"], "team", team_root / master.stem,
+                        lambda team: team_root / str(team).upper() / base_name)
+
+
+def _write_team_split(
+    df: pd.DataFrame, team_root: pathlib.Path, base_name: str, *,
+    force: bool, src: pathlib.Path,
+) -> None:
+    """
+    Per-team copies of one cleaned file. Parquet output goes into a single
+    hive-partitioned dataset (teams/<stem>/team=<TEAM>/…) in one Arrow pass;
+    CSV output keeps one teams/<TEAM>/<file>.csv per team.
+    """
+    if PROCESSED_FORMAT == "parquet":
+        write_partitioned(df, team_root / pathlib.Path(base_name).stem, "team",
+                          force=force, src=src)
         return
-    path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(path, index=False)
+
+    team_files = [
+        (team_root / str(team).upper() / base_name, grp)      # ← str()
+        for team, grp in df.groupby("team", observed=True)
+    ]
+    # ~30 small independent writes – overlap their file I/O on threads
+    with ThreadPoolExecutor(max_workers=WRITE_THREADS) as ex:
+        list(ex.map(lambda tf: write_table(*tf, force=force, src=src), team_files))
 
 
 # ── one-file cleaner ────────────────────────────────────────────────────────
 def clean_one_csv(
     src: pathlib.Path,
     dst_main: pathlib.Path,
-    team_root: pathlib.Path,
     *,
     force: bool,
 ) -> pd.DataFrame | None:
-    """Clean `src` → write master + per-team copies and return cleaned DataFrame."""
-    df = pd.read_csv(src)
+    """Clean `src` → write the master file and return the cleaned DataFrame."""
+    # C parser, not read_raw_csv: the GAME_DATE text must be kept exactly as written
+    df = pd.read_csv(src, dtype=_TEXT_DTYPES, low_memory=False)
     if df.empty:
         print(f"⚠️  {src.name}: empty file — skipped")
         return None
 
     df.columns = normalise_cols(df.columns)
-    _standardise_team_abbrev(df)
-    _add_season_bounds(df)
+    standardise_team_abbrev(df)
+    add_season_bounds(df)
 
-    exclude = set(df.select_dtypes(include=["object", "datetime"]).columns)
-    df = coerce_all_numeric(df, list(exclude))
-    df.drop_duplicates(inplace=True)
+    # text (kind "O": object / str) and datetime ("M") columns keep their parsed values
+    exclude = [c for c, dt in df.dtypes.items() if dt.kind in "OM"]
+    df = coerce_all_numeric(df, exclude)
+    df = downcast_ints(df)                # int64 → int32 where the values fit
+    dedupe_raw_rows(df, SEASON_BOUNDS)
 
     if df.empty:
         print(f"⚠️  {src.name}: no rows after cleaning — skipped")
         return None
 
     # master file
-    _write_csv(dst_main, df, force=force)
-    print(f"✅ {dst_main.relative_to(ROOT)}  ({len(df):,} rows)")
+    write_table(dst_main, df, force=force, src=src)
+    print(f"✅ {str(processed_path(dst_main))[len(ROOT_STR):]}  ({len(df):,} rows)")
     return df
 
 
 
 # ── season driver ───────────────────────────────────────────────────────────
+def _clean_and_split(task: tuple[pathlib.Path, pathlib.Path, bool]) -> None:
+    """Pool worker: clean one raw CSV and write its per-team copies."""
+    csv_path, proc_dir, force = task
+    base_name = csv_path.name
+    out_main  = proc_dir / base_name
+
+    # without -f a file whose master and team copies are all newer than the raw
+    # file is kept – don't re-parse it; stale or missing outputs are rewritten
+    if not force and up_to_date(csv_path, out_main,
+                                lambda m: _team_copies(m, proc_dir / "teams")):
+        return
+
+    df = clean_one_csv(csv_path, out_main, force=force)
+    if df is None or df.empty:
+        return
+
+    # team split – grouped / partitioned on category codes rather than every string
+    if "team" in df.columns:
+        df["team"] = df["team"].astype("category")
+        _write_team_split(df, proc_dir / "teams", base_name, force=force, src=csv_path)
+
+
 def clean_season(season: str, *, force: bool) -> None:
     raw_dir   = RAW_ROOT  / season
     proc_dir  = PROC_ROOT / season
 
-
     if not raw_dir.exists():
         print(f"⚠️  no raw data for {season}")
         return
 
-    for csv_path in raw_dir.glob("*.csv"):
-        base_name = csv_path.name
-        out_main  = proc_dir / base_name
-        
-        df = clean_one_csv(csv_path, out_main, proc_dir / "teams", force=force)
-        if df is None or df.empty:
-            continue
-
-
-                # team split
-        if "team" in df.columns:
-            for team, grp in df.groupby("team"):
-                team_file = proc_dir / "teams" / str(team).upper() / base_name  # ← str()
-                _write_csv(team_file, grp, force=force)
+    # files are independent → one process per CSV, team copies written by the worker
+    tasks = [(csv_path, proc_dir, force) for csv_path in csv_files(raw_dir)]
+    with ProcessPoolExecutor() as ex:
+        list(ex.map(_clean_and_split, tasks))
 
 
 # ── CLI helpers ─────────────────────────────────────────────────────────────
 def all_seasons() -> List[str]:
-    if not RAW_ROOT.exists():
-        return []
-    return sorted(p.name for p in RAW_ROOT.iterdir() if p.is_dir())
+    return subdir_names(RAW_ROOT)
 
 
 def parse_cli() -> argparse.Namespace:
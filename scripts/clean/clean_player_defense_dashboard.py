@@ -7,26 +7,45 @@ Clean the raw ‘player defense_dashboard’ tables (totals / per_game / per48)
 create per-team copies that live in:
 
     …/teams/<TEAM>/<totals|per_game|per48>/<filename>.csv
+
+With PROCESSED_FORMAT=parquet the team copies of each file are one
+hive-partitioned dataset instead:
+
+    …/teams/<totals|per_game|per48>/<file-stem>/team=<TEAM>/part-0.parquet
 """
 
 from __future__ import annotations
 
 import argparse
+import os
 import pathlib
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Iterable, List
 
 import pandas as pd
 
 ROOT = pathlib.Path(__file__).resolve().parents[2]
+ROOT_STR = str(ROOT) + os.sep         # log paths relative to the repo root
 sys.path.append(str(ROOT))
 
-from utils.clean_helpers import normalise_cols
-from utils.numeric_helpers import coerce_all_numeric
+from utils.clean_helpers import (
+    PROCESSED_FORMAT, SEASON_BOUNDS, WRITE_THREADS, add_season_bounds, csv_files,
+    csv_row_lines, dedupe_raw_rows, normalise_cols, processed_path,
+    read_processed_columns, read_raw_csv, split_copies, subdir_names, up_to_date,
+    upper_labels, write_partitioned, write_table,
+)
+from utils.numeric_helpers import coerce_all_numeric, downcast_ints
 
 RAW_ROOT  = ROOT / "data/raw/player_stats/defense_dashboard"
 PROC_ROOT = ROOT / "data/processed/player_stats/defense_dashboard"
 
+# raw text columns – typed up front so the parser skips inferring them
+_TEXT_DTYPES = {c: str for c in (
+    "PLAYER_NAME", "NICKNAME", "TEAM_ABBREVIATION", "TEAM_NAME",
+    "PLAYER_LAST_TEAM_ABBREVIATION", "SEASON_YEAR",
+)}
+
 
 # ── column helpers ──────────────────────────────────────────────────────────
 def _ensure_team(df: pd.DataFrame) -> None:
@@ -35,35 +54,27 @@ def _ensure_team(df: pd.DataFrame) -> None:
     per-team files regardless of which raw field is present.
     """
     if "team" in df.columns:
-        df["team"] = df["team"].fillna("").astype(str).str.upper()
+        df["team"] = upper_labels(df["team"])
         return
 
     if "team_abbreviation" in df.columns:
-        df["team"] = df["team_abbreviation"].fillna("").astype(str).str.upper()
+        df["team"] = upper_labels(df["team_abbreviation"])
     elif "team_name" in df.columns:
-        df["team"] = (
-            df["team_name"].fillna("").astype(str).str.upper().str.replace(" ", "_")
-        )
+        df["team"] = upper_labels(df["team_name"]).str.replace(" ", "_")
     elif "team_id" in df.columns:
         df["team"] = df["team_id"].astype(str)
 
 
-def _add_season_bounds(df: pd.DataFrame) -> None:
-    if "season_year" in df.columns:
-        df.rename(columns={"season_year": "season"}, inplace=True)
-
-    if "season" in df.columns:
-        yr = df["season"].astype(str).str.extract(r"^(\d{4})", expand=False)
-        df["season_start"] = pd.to_numeric(yr, errors="coerce")
-        df["season_end"]   = df["season_start"] + 1
-
-
-# ── tiny I/O helper ─────────────────────────────────────────────────────────
-def _write_csv(path: pathlib.Path, df: pd.DataFrame, *, force: bool) -> None:
-    if path.exists() and not force:
-        return
-    path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(path, index=False)
+def _team_copies(master: pathlib.Path, team_root: pathlib.Path) -> list[pathlib.Path]:
+    """The per-team copies the cleaned league-wide file `master` should have."""
+    keys = read_processed_columns(master, ["team"])
+    if "team" not in keys.columns:
+        return []
+    per_mode = master.parent.name            # totals | per_game | per48
+    return split_copies(
+        keys["team"], "team", team_root / per_mode / master.stem,
+        lambda team: team_root / str(team).upper() / per_mode / master.name,
+    )
 
 
 # ── one-file cleaner ────────────────────────────────────────────────────────
@@ -75,7 +86,12 @@ def _clean_one(
     force: bool,
 ) -> None:
     """Clean one CSV, write league-wide file + per-team copies."""
-    df = pd.read_csv(src)
+    # without -f a file whose master and team copies are all newer than the raw
+    # file is kept – don't re-parse it; stale or missing outputs are rewritten
+    if not force and up_to_date(src, dst_master, lambda m: _team_copies(m, team_root)):
+        return
+
+    df = read_raw_csv(src, _TEXT_DTYPES)
     if df.empty:
         print(f"⚠️  {src.name}: empty — skipped")
         return
@@ -93,32 +109,46 @@ def _clean_one(
     )
     
     _ensure_team(df)
-    _add_season_bounds(df)
+    add_season_bounds(df)
 
-    non_num = set(df.select_dtypes(include=["object", "datetime"]).columns)
-    df = coerce_all_numeric(df, list(non_num))
-    df.drop_duplicates(inplace=True)
+    # text (kind "O": object / str) and datetime ("M") columns keep their parsed values
+    non_num = [c for c, dt in df.dtypes.items() if dt.kind in "OM"]
+    df = coerce_all_numeric(df, non_num)
+    df = downcast_ints(df)                # int64 → int32 where the values fit
+    dedupe_raw_rows(df, SEASON_BOUNDS)
 
     if df.empty:
         print(f"⚠️  {src.name}: no rows after cleaning — skipped")
         return
 
+    # CSV output: format every row once – the league-wide file and the
+    # team mirrors below are joins over the same rendered lines
+    rows = csv_row_lines(df) if PROCESSED_FORMAT == "csv" else None
+
     # league-wide file
-    _write_csv(dst_master, df, force=force)
-    print(f"✅ {dst_master.relative_to(ROOT)}  ({len(df):,} rows)")
+    write_table(dst_master, df if rows is None else rows[0] + "".join(rows[1]),
+                force=force, src=src)
+    print(f"✅ {str(processed_path(dst_master))[len(ROOT_STR):]}  ({len(df):,} rows)")
 
     # per-team mirrors
 # per-team copies  (totals / per_game / per48 under each club)
     if "team" in df.columns:
         per_mode = dst_master.parent.name        # totals | per_game | per48
-        for team, grp in df.groupby("team"):
-            team_path = (
-                team_root
-                / str(team).upper()              # ← cast then upper()
-                / per_mode
-                / dst_master.name
-            )
-            _write_csv(team_path, grp, force=force)
+        # ~30 teams → group on category codes rather than hashing every string
+        df["team"] = df["team"].astype("category")
+        if PROCESSED_FORMAT == "parquet":
+            # one hive-partitioned dataset: teams/<mode>/<file-stem>/team=<TEAM>/…
+            write_partitioned(df, team_root / per_mode / dst_master.stem, "team",
+                              force=force, src=src)
+            return
+        team_files = [
+            (team_root / str(team).upper() / per_mode / dst_master.name,  # ← cast then upper()
+             df.iloc[idx] if rows is None else rows[0] + "".join(rows[1][idx]))
+            for team, idx in df.groupby("team", observed=True).indices.items()
+        ]
+        # ~30 small independent writes – overlap their file I/O on threads
+        with ThreadPoolExecutor(max_workers=WRITE_THREADS) as ex:
+            list(ex.map(lambda tf: write_table(*tf, force=force, src=src), team_files))
 
 
 
@@ -132,15 +162,20 @@ def _clean_season(season: str, *, force: bool) -> None:
         print(f"⚠️  no raw data for {season}")
         return
 
-    for mode in ["totals", "per_game", "per48"]:
-        for csv in (raw_season / mode).glob("*.csv"):
-            dst_master = proc_season / mode / csv.name
-            _clean_one(csv, dst_master, team_root, force=force)
+    # every file is independent → clean them in parallel processes
+    with ProcessPoolExecutor() as ex:
+        jobs = [
+            ex.submit(_clean_one, csv, proc_season / mode / csv.name, team_root, force=force)
+            for mode in ["totals", "per_game", "per48"]
+            for csv in csv_files(raw_season / mode)
+        ]
+        for job in jobs:
+            job.result()                     # re-raise worker errors
 
 
 # ── CLI helpers ─────────────────────────────────────────────────────────────
 def _seasons_on_disk() -> List[str]:
-    return sorted(p.name for p in RAW_ROOT.iterdir() if p.is_dir()) if RAW_ROOT.exists() else []
+    return subdir_names(RAW_ROOT)
 
 def _parse_cli() -> argparse.Namespace:
     ap = argparse.ArgumentParser(
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """
-Clean *all* player-stats CSVs under data/raw/player_stats/**  ➜  parquet.
+Clean *all* player-stats CSVs under data/raw/player_stats/**  ➜  one table per
+module (CSV, or Parquet with PROCESSED_FORMAT=parquet).
 
 Usage
 -----
@@ -14,6 +15,8 @@ import re, sys
 from pathlib import Path
 import argparse
 import pathlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Iterable, Optional, Tuple
 import pandas as pd
 
@@ -22,8 +25,10 @@ sys.path.append(str(ROOT))
 # Ensure utils package is recognized
 (ROOT / "utils" / "__init__.py").touch(exist_ok=True)
 
-from utils.clean_helpers   import normalise_cols
-from utils.numeric_helpers import coerce_all_numeric
+from utils.clean_helpers   import (
+    normalise_cols, processed_path, read_raw_csv, subdir_names, write_processed,
+)
+from utils.numeric_helpers import coerce_all_numeric, downcast_ints
 
 RAW_ROOT   = pathlib.Path("data/raw/player_stats")
 PROC_ROOT  = pathlib.Path("data/processed/player_stats")
@@ -33,11 +38,14 @@ PROC_ROOT  = pathlib.Path("data/processed/player_stats")
 MODULE_RE = re.compile(r"player_stats[\\/](?P<module>[^\\/]+)[\\/]")
 
 # Columns that must stay *textual*
-TEXT_COLS = {
+TEXT_COLS = frozenset({
     "player", "player_name", "team", "team_abbreviation", "team_name",
     "team_city", "team_id", "player_id", "player_display_first_last",
     "matchup", "game_id", "wl", "measure_type"
-}
+})
+
+# Arrow infers ISO timestamps, pandas' C parser never did → keep dates as text
+RAW_TEXT_DTYPES = {"GAME_DATE": str}
 
 # ---------------------------------------------------------------------------
 
@@ -48,19 +56,27 @@ def meta_from_path(csv_path: pathlib.Path) -> Tuple[str, str, str, str]:
     Path layout:
       data/raw/player_stats/<module>/<season>/<per_mode>/<file>.csv
     """
-    rel = csv_path.relative_to(RAW_ROOT)
-    module, season, per_mode = rel.parts[:3]          # safe: we control layout
+    parts = _folder_parts(csv_path.parent)
+    if len(parts) < 3:                                # box-score logs sit in <season>/
+        parts += (csv_path.name,)
+    module, season, per_mode = parts[:3]              # safe: we control layout
     season_type = csv_path.stem.split("_", 1)[0]      # regular_season / playoffs
     return module, season, season_type, per_mode
 
 
+@lru_cache(maxsize=None)
+def _folder_parts(csv_dir: pathlib.Path) -> Tuple[str, ...]:
+    # shared by every file of a folder → relative_to / parts once per folder
+    return csv_dir.relative_to(RAW_ROOT).parts[:3]
+
+
 def clean_one(csv_path: pathlib.Path) -> Tuple[Optional[str], Optional[pd.DataFrame]]:
     """
     Read a single CSV, normalise, add metadata.
     Returns (None, None) if the CSV is empty.
     """
     module, season, season_type, per_mode = meta_from_path(csv_path)
-    df = pd.read_csv(csv_path)
+    df = read_raw_csv(csv_path, RAW_TEXT_DTYPES)
 
     if df.empty:                       # <- skip zero-row files
         return None, None
@@ -71,8 +87,9 @@ def clean_one(csv_path: pathlib.Path) -> Tuple[Optional[str], Optional[pd.DataFr
     df["season_type"] = season_type
     df["per_mode"]    = per_mode
 
-    exclude = TEXT_COLS.intersection(df.columns)
+    exclude = TEXT_COLS & set(df.columns)     # set ∩ set – no pass over the Index API
     df = coerce_all_numeric(df, exclude_cols=list(exclude))
+    df = downcast_ints(df)                # int64 → int32 where the values fit
 
     return module, df
 
@@ -81,28 +98,36 @@ def clean_one(csv_path: pathlib.Path) -> Tuple[Optional[str], Optional[pd.DataFr
 # 3) process_modules – type-safe checks against '--module' CLI argument
 # -------------------------------------------------------------------------
 def process_modules(target_modules: Optional[Iterable[str]] = None) -> None:
-    buffers: dict[str, list[pd.DataFrame]] = {}
-
-    for csv in RAW_ROOT.rglob("*.csv"):
-        module, df = clean_one(csv)
-        if df is None or module is None:  # empty file or module is None → skip
-            continue
+    # the module is the first folder level → prune unselected modules before
+    # descending into them, then group the files of each selected module
+    by_module: dict[str, list[pathlib.Path]] = {}
+    for module in subdir_names(RAW_ROOT):
         if target_modules and module not in target_modules:
             continue
-        buffers.setdefault(module, []).append(df)
-
-    if not buffers:
+        csvs = list((RAW_ROOT / module).rglob("*.csv"))
+        if csvs:
+            by_module[module] = csvs
+
+    written = 0
+    with ProcessPoolExecutor() as ex:
+        for module, csvs in by_module.items():
+            # one module in memory at a time – its frames are released once written;
+            # files are independent → cleaned in parallel (map keeps file order)
+            frames = [df for _, df in ex.map(clean_one, csvs, chunksize=4) if df is not None]
+            if not frames:                    # every file empty → skip
+                continue
+
+            out_dir  = PROC_ROOT / module
+            out_dir.mkdir(parents=True, exist_ok=True)
+            out_path = processed_path(out_dir / f"{module}_cleaned.csv")   # PROCESSED_FORMAT
+
+            write_processed(pd.concat(frames, ignore_index=True), out_path)
+            print(f"✅ {module:12s} → {out_path}   "
+                  f"({len(frames)} files, {sum(len(f) for f in frames):,} rows)")
+            written += 1
+
+    if not written:
         print("⚠️  No matching CSV files found.")
-        return
-
-    for module, frames in buffers.items():
-        out_dir  = PROC_ROOT / module
-        out_dir.mkdir(parents=True, exist_ok=True)
-        out_path = out_dir / f"{module}_cleaned.csv"
-
-        pd.concat(frames, ignore_index=True).to_csv(out_path, index=False)
-        print(f"✅ {module:12s} → {out_path}   "
-              f"({len(frames)} files, {sum(len(f) for f in frames):,} rows)")
 
 
 
@@ -110,7 +135,7 @@ def process_modules(target_modules: Optional[Iterable[str]] = None) -> None:
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
-        description="Clean all player-stats CSVs into parquet."
+        description="Clean all player-stats CSVs into one table per module."
     )
     parser.add_argument(
         "--module", "-m",
@@ -10,6 +10,9 @@ clean_boxscores.py
       <season>/teams/<TEAM>/<same-filename>.csv
   – No concatenation: every copy keeps the rows that belong to that
     month / that team *only*.
+  With PROCESSED_FORMAT=parquet each split is one hive-partitioned dataset:
+      <season>/months/<file-stem>/MON=<MON>/part-0.parquet
+      <season>/teams/<file-stem>/team=<TEAM>/part-0.parquet
 
 CLI
 ---
@@ -22,8 +25,12 @@ CLI
 from __future__ import annotations
 
 import argparse
+import calendar
+import os
 import pathlib
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from typing import Iterable, List
 
 import numpy as np
@@ -31,14 +38,23 @@ import pandas as pd
 
 # ── project helpers ─────────────────────────────────────────────────────────
 ROOT = pathlib.Path(__file__).resolve().parents[2]
+ROOT_STR = str(ROOT) + os.sep         # log paths relative to the repo root
 sys.path.append(str(ROOT))
 
-from utils.clean_helpers import normalise_cols          # type: ignore
-from utils.numeric_helpers import coerce_all_numeric    # type: ignore
+from utils.clean_helpers import (  # type: ignore
+    PROCESSED_FORMAT, SEASON_BOUNDS, add_season_bounds, code_slices, csv_files,
+    dedupe_raw_rows, normalise_cols, processed_path, read_processed_columns,
+    read_raw_csv, split_copies, standardise_team_abbrev, subdir_names, up_to_date,
+    write_partitioned, write_table,
+)
+from utils.numeric_helpers import coerce_all_numeric, downcast_ints    # type: ignore
 
 RAW_ROOT  = ROOT / "data/raw/team_stats/box_scores"
 PROC_ROOT = ROOT / "data/processed/team_stats/box_scores"
 
+# added by the cleaner, not read from the raw file
+_DERIVED_COLS = [*SEASON_BOUNDS, "is_home", "home", "away"]
+
 # ────────────────────────────────────────────────────────────────────────────
 # column helpers
 # ────────────────────────────────────────────────────────────────────────────
@@ -47,66 +63,130 @@ def _parse_game_date(df: pd.DataFrame) -> None:
         df["game_date"] = pd.to_datetime(df["game_date"], errors="coerce")
 
 
-def _standardise_team_abbrev(df: pd.DataFrame) -> None:
-    if "team_abbreviation" in df.columns:
-        df.rename(columns={"team_abbreviation": "team"}, inplace=True)
-    if "team" in df.columns:
-        df["team"] = df["team"].fillna("").astype(str).str.upper()
-
-
-def _add_season_bounds(df: pd.DataFrame) -> None:
-    if "season_year" in df.columns:
-        df.rename(columns={"season_year": "season"}, inplace=True)
-    if "season" in df.columns:
-        start = df["season"].astype(str).str.extract(r"^(\d{4})", expand=False)
-        df["season_start"] = pd.to_numeric(start, errors="coerce")
-        df["season_end"]   = df["season_start"] + 1
-
+# "<TEAM> vs. <OPP>" (home) / "<TEAM> @ <OPP>" (away); no separator → whole string is TEAM
+_MATCHUP_RE = re.compile(r"^(.*?)(?:\s+(vs\.|@)\s+(.*))?$")
 
 def _derive_home_away(df: pd.DataFrame) -> None:
     if "matchup" not in df.columns:
         return
-    df["is_home"] = df["matchup"].str.contains(r"\s+vs\.\s+", regex=True)
-    sides = df["matchup"].str.split(r"\s+vs\.\s+|\s+@\s+", n=1, expand=True)
-    df["home"] = np.where(df["is_home"], sides[0], sides[1])
-    df["away"] = np.where(df["is_home"], sides[1], sides[0])
+    # one regex pass yields both sides and the separator; every game shows up
+    # once per side, so match the distinct strings and expand by factorize code
+    codes, uniq = pd.factorize(df["matchup"])               # NaN → code -1
+    parts = (pd.Series(uniq).str.extract(_MATCHUP_RE)       # 0 = team, 1 = sep, 2 = opp
+               .reindex(codes).set_axis(df.index))
+    is_home = parts[1].eq("vs.")
+    df["is_home"] = is_home
+    # start from the team/opp columns and swap only the road rows in place –
+    # the masks are complementary, so one boolean index does both sides
+    home = parts[0].to_numpy(dtype=object, copy=True)
+    away = parts[2].to_numpy(dtype=object, copy=True)
+    flip = ~is_home.to_numpy()
+    home[flip], away[flip] = away[flip], home[flip]
+    df["home"] = home
+    df["away"] = away
 
 # ────────────────────────────────────────────────────────────────────────────
-def _write_csv(path: pathlib.Path, df: pd.DataFrame, *, force: bool) -> None:
-    if path.exists() and not force:
-        return
-    path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(path, index=False)
+# raw (pre-normalise) text columns: declared up front so neither parser
+# has to infer them; the stat columns are left to come through numeric
+_TEXT_DTYPES = {c: str for c in (
+    "TEAM_ABBREVIATION", "TEAM_NAME", "MATCHUP", "GAME_DATE", "WL", "SEASON_YEAR",
+)}
 
 # ────────────────────────────────────────────────────────────────────────────
 def clean_one_csv(src: pathlib.Path, dst: pathlib.Path, *, force: bool) -> pd.DataFrame | None:
     """clean → write main file, return df for splitting"""
-    df = pd.read_csv(src)
+    df = read_raw_csv(src, _TEXT_DTYPES)
     if df.empty:
         print(f"⚠️  {src.name}: empty file — skipped")
         return None
 
     df.columns = normalise_cols(df.columns)
     _parse_game_date(df)
-    _standardise_team_abbrev(df)
-    _add_season_bounds(df)
+    standardise_team_abbrev(df)
+    add_season_bounds(df)
     _derive_home_away(df)
 
-    exclude = set(df.select_dtypes(include=["object", "datetime"]).columns)
-    df = coerce_all_numeric(df, list(exclude))
-    df.drop_duplicates(inplace=True)
+    # text (kind "O": object / str) and datetime ("M") columns keep their parsed values
+    exclude = [c for c, dt in df.dtypes.items() if dt.kind in "OM"]
+    df = coerce_all_numeric(df, exclude)
+    df = downcast_ints(df)                # int64 → int32 where the values fit
+    dedupe_raw_rows(df, _DERIVED_COLS)
 
     if df.empty:
         print(f"⚠️  {src.name}: no rows after cleaning — skipped")
         return None
 
-    _write_csv(dst, df, force=force)
-    print(f"✅ {dst.relative_to(ROOT)}  ({len(df):,} rows)")
+    write_table(dst, df, force=force, src=src)
+    print(f"✅ {str(processed_path(dst))[len(ROOT_STR):]}  ({len(df):,} rows)")
     return df
 
 # ────────────────────────────────────────────────────────────────────────────
-def _month_abbr(series: pd.Series) -> pd.Series:
-    return pd.to_datetime(series).dt.strftime("%b").str.upper()
+_MONTHS = pd.Series([m.upper() for m in calendar.month_abbr[1:]], index=range(1, 13))
+
+def _month_abbr(month: pd.Series) -> pd.Series:
+    # month numbers (game_date.dt.month) → JAN … DEC, no strftime per row
+    return month.map(_MONTHS)
+
+def _split_copies(master: pathlib.Path, proc_dir: pathlib.Path) -> list[pathlib.Path]:
+    """The month and team copies the cleaned file `master` should have."""
+    keys = read_processed_columns(master, ["game_date", "team"])
+    base_name, stem = master.with_suffix(".csv").name, master.stem
+    copies = []
+    if "game_date" in keys.columns:
+        month = pd.to_datetime(keys["game_date"], format="ISO8601", errors="coerce").dt.month
+        copies += split_copies(_month_abbr(month), "MON", proc_dir / "months" / stem,
+                               lambda mon: proc_dir / mon / base_name)
+    if "team" in keys.columns:
+        copies += split_copies(keys["team"], "team", proc_dir / "teams" / stem,
+                               lambda team: proc_dir / "teams" / str(team).upper() / base_name)
+    return copies
+
+def _clean_and_split(task: tuple[pathlib.Path, pathlib.Path, bool]) -> None:
+    """Pool worker: clean one raw CSV and write its month / team copies."""
+    csv_path, proc_dir, force = task
+    base_name = csv_path.name
+    out_main  = proc_dir / base_name
+
+    # without -f a file whose master, month and team copies are all newer than
+    # the raw file is kept – don't re-parse it; stale or missing ones are rewritten
+    if not force and up_to_date(csv_path, out_main, lambda m: _split_copies(m, proc_dir)):
+        return
+
+    df = clean_one_csv(csv_path, out_main, force=force)
+    if df is None or df.empty:
+        return
+
+    # low-cardinality label → int codes: both splits group on codes, slices stay small
+    if "team" in df.columns:
+        df["team"] = df["team"].astype("category")
+
+    month   = df["game_date"].dt.month          # extracted once: split codes + MON labels
+    mon_key = _month_abbr(month)
+    if PROCESSED_FORMAT == "parquet":
+        # each split is one hive-partitioned dataset, written in a single Arrow pass:
+        #   months/<file-stem>/MON=<MON>/…   teams/<file-stem>/team=<TEAM>/…
+        stem = pathlib.Path(base_name).stem
+        dated = mon_key.notna()                 # the CSV split below skips NaT months too
+        write_partitioned(df[dated].assign(MON=mon_key[dated]),
+                          proc_dir / "months" / stem, "MON", force=force, src=csv_path)
+        if "team" in df.columns:
+            write_partitioned(df.assign(MON=mon_key), proc_dir / "teams" / stem, "team",
+                              force=force, src=csv_path)
+        return
+
+    # month split – contiguous runs of the sorted month numbers (NaT → -1, skipped);
+    # the slices are taken before MON is added, so they carry no MON column
+    for mon, idx in code_slices(month.fillna(-1).to_numpy(dtype=np.int64)):
+        month_file = proc_dir / _MONTHS[mon] / base_name
+        write_table(month_file, df.iloc[idx], force=force, src=csv_path)
+
+    # team split (team copies carry the MON column) – runs of the category codes
+    df["MON"] = mon_key
+    if "team" in df.columns:
+        teams = df["team"].cat.categories
+        for code, idx in code_slices(df["team"].cat.codes.to_numpy()):
+            team_file = proc_dir / "teams" / str(teams[code]).upper() / base_name  # ← str()
+            write_table(team_file, df.iloc[idx], force=force, src=csv_path)
 
 def clean_season(season: str, *, force: bool = False) -> None:
     raw_dir  = RAW_ROOT  / season
@@ -115,29 +195,14 @@ def clean_season(season: str, *, force: bool = False) -> None:
         print(f"⚠️  no raw data for {season}")
         return
 
-    for csv_path in raw_dir.glob("*.csv"):
-        base_name = csv_path.name
-        out_main  = proc_dir / base_name
-
-        df = clean_one_csv(csv_path, out_main, force=force)
-        if df is None or df.empty:
-            continue
-
-        # month split
-        df["MON"] = _month_abbr(df["game_date"])
-        for mon, grp in df.groupby("MON"):
-            month_file = proc_dir / str(mon).upper() / base_name      # ← str() fixes Path /
-            _write_csv(month_file, grp.drop(columns="MON"), force=force)
-
-        # team split
-        if "team" in df.columns:
-            for team, grp in df.groupby("team"):
-                team_file = proc_dir / "teams" / str(team).upper() / base_name  # ← str()
-                _write_csv(team_file, grp, force=force)
+    # files are independent → one process per CSV, splits written by the worker
+    tasks = [(csv_path, proc_dir, force) for csv_path in csv_files(raw_dir)]
+    with ProcessPoolExecutor() as ex:
+        list(ex.map(_clean_and_split, tasks))
 
 # ────────────────────────────────────────────────────────────────────────────
 def all_seasons() -> List[str]:
-    return sorted(p.name for p in RAW_ROOT.iterdir() if p.is_dir())
+    return subdir_names(RAW_ROOT)
 
 def parse_cli() -> argparse.Namespace:
     ap = argparse.ArgumentParser(
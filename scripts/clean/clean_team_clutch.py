@@ -48,68 +48,60 @@ CLI
 from __future__ import annotations
 
 import argparse
+import os
 import pathlib
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from typing import Iterable, List
 
 import pandas as pd
 
 ROOT = pathlib.Path(__file__).resolve().parents[2]
+ROOT_STR = str(ROOT) + os.sep         # log paths relative to the repo root
 sys.path.append(str(ROOT))
 
-from utils.clean_helpers import normalise_cols          # type: ignore
-from utils.numeric_helpers import coerce_all_numeric    # type: ignore
+from utils.clean_helpers import (  # type: ignore
+    SEASON_BOUNDS, add_season_bounds, csv_files, dedupe_raw_rows, normalise_cols,
+    processed_path, read_raw_csv, standardise_team_abbrev, subdir_names, up_to_date,
+    write_table,
+)
+from utils.numeric_helpers import coerce_all_numeric, downcast_ints    # type: ignore
 
 RAW_ROOT  = ROOT / "data/raw/team_stats/clutch"
 PROC_ROOT = ROOT / "data/processed/team_stats/clutch"
 
-
-# ── column helpers ──────────────────────────────────────────────────────────
-def _standardise_team_abbrev(df: pd.DataFrame) -> None:
-    if "team_abbreviation" in df.columns:
-        df.rename(columns={"team_abbreviation": "team"}, inplace=True)
-    if "team" in df.columns:
-        df["team"] = df["team"].fillna("").astype(str).str.upper()
-
-
-def _add_season_bounds(df: pd.DataFrame) -> None:
-    if "season_year" in df.columns:
-        df.rename(columns={"season_year": "season"}, inplace=True)
-    if "season" in df.columns:
-        start = df["season"].astype(str).str.extract(r"^(\d{4})", expand=False)
-        df["season_start"] = pd.to_numeric(start, errors="coerce")
-        df["season_end"]   = df["season_start"] + 1
-
-
-# ── I/O helper ──────────────────────────────────────────────────────────────
-def _write_csv(path: pathlib.Path, df: pd.DataFrame, *, force: bool) -> None:
-    if path.exists() and not force:
-        return
-    path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(path, index=False)
+# raw text columns – typed up front so the parser skips inferring them
+_TEXT_DTYPES = {c: str for c in ("TEAM_ABBREVIATION", "TEAM_NAME", "SEASON_YEAR")}
 
 
 # ── core cleaner ────────────────────────────────────────────────────────────
 def clean_one_csv(src: pathlib.Path, dst: pathlib.Path, *, force: bool) -> None:
-    df = pd.read_csv(src)
+    # without -f an output newer than its raw file is kept – don't re-parse it;
+    # a raw file changed since then is rebuilt over its stale outputs
+    if not force and up_to_date(src, dst):
+        return
+
+    df = read_raw_csv(src, _TEXT_DTYPES)
     if df.empty:
         print(f"⚠️  {src.name}: empty file — skipped")
         return
 
     df.columns = normalise_cols(df.columns)
-    _standardise_team_abbrev(df)
-    _add_season_bounds(df)
+    standardise_team_abbrev(df)
+    add_season_bounds(df)
 
-    exclude = set(df.select_dtypes(include=["object", "datetime"]).columns)
-    df = coerce_all_numeric(df, list(exclude))
-    df.drop_duplicates(inplace=True)
+    # text (kind "O": object / str) and datetime ("M") columns keep their parsed values
+    exclude = [c for c, dt in df.dtypes.items() if dt.kind in "OM"]
+    df = coerce_all_numeric(df, exclude)
+    df = downcast_ints(df)                # int64 → int32 where the values fit
+    dedupe_raw_rows(df, SEASON_BOUNDS)
 
     if df.empty:
         print(f"⚠️  {src.name}: no rows after cleaning — skipped")
         return
 
-    _write_csv(dst, df, force=force)
-    print(f"✅ {dst.relative_to(ROOT)}  ({len(df):,} rows)")
+    write_table(dst, df, force=force, src=src)
+    print(f"✅ {str(processed_path(dst))[len(ROOT_STR):]}  ({len(df):,} rows)")
 
 
 def clean_season(season: str, *, force: bool) -> None:
@@ -119,17 +111,20 @@ def clean_season(season: str, *, force: bool) -> None:
         print(f"⚠️  no raw data for {season}")
         return
 
-    for sub in ["totals", "per_game"]:
-        for csv_path in (raw_dir / sub).glob("*.csv"):
-            out_path = proc_dir / sub / csv_path.name
-            clean_one_csv(csv_path, out_path, force=force)
+    # every file is independent → clean them in parallel processes
+    with ProcessPoolExecutor() as ex:
+        jobs = [
+            ex.submit(clean_one_csv, csv_path, proc_dir / sub / csv_path.name, force=force)
+            for sub in ["totals", "per_game"]
+            for csv_path in csv_files(raw_dir / sub)
+        ]
+        for job in jobs:
+            job.result()                     # re-raise worker errors
 
 
 # ── CLI plumbing ────────────────────────────────────────────────────────────
 def all_seasons() -> List[str]:
-    if not RAW_ROOT.exists():
-        return []
-    return sorted(p.name for p in RAW_ROOT.iterdir() if p.is_dir())
+    return subdir_names(RAW_ROOT)
 
 
 def parse_cli() -> argparse.Namespace:
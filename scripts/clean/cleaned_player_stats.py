@@ -1,8 +1,10 @@
 import pandas as pd
 import pathlib, sys
+from concurrent.futures import ProcessPoolExecutor
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
-from utils.clean_helpers import normalise_cols
+from utils.clean_helpers import normalise_cols, processed_path, read_raw_csv, write_processed
+from utils.numeric_helpers import coerce_all_numeric
 import os
 
 file_paths = [
@@ -18,7 +20,7 @@ file_paths = [
 
 def clean_player_stats_csv(input_path, output_path):
     try:
-        df = pd.read_csv(input_path)
+        df = read_raw_csv(input_path)
 
         # Normalize column names
         df.columns = normalise_cols(df.columns)
@@ -36,30 +38,33 @@ def clean_player_stats_csv(input_path, output_path):
             df['team'] = df['team'].fillna('').astype(str).str.strip().replace('', 'FA')
 
         # Convert numeric columns (excluding identifier columns)
+        # (columns Arrow already parsed as numbers are left as they are)
         exclude_cols = ['player', 'team', 'pos', 'season', 'player_id']
-        for col in df.columns:
-            if col not in exclude_cols:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+        df = coerce_all_numeric(df, exclude_cols)
 
         # Drop exact duplicates only (not multi-team appearances)
         df = df.drop_duplicates()
 
         # Ensure output directory exists
+        output_path = processed_path(pathlib.Path(output_path))   # .csv or .parquet (PROCESSED_FORMAT)
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
         # Save cleaned data
-        df.to_csv(output_path, index=False)
+        write_processed(df, output_path)
         print(f"✅ Saved {output_path}")
 
     except Exception as e:
         print(f"❌ Failed to process {input_path}: {e}")
 
 def run_cleaning():
+    output_paths = []
     for input_path in file_paths:
         stat_type = input_path.split("/")[3]
         year = os.path.splitext(os.path.basename(input_path))[0]
-        output_path = f"data/processed/player_stats/{stat_type}/{year}.csv"
-        clean_player_stats_csv(input_path, output_path)
+        output_paths.append(f"data/processed/player_stats/{stat_type}/{year}.csv")
+    # files share no state → one process each; list() waits for them all
+    with ProcessPoolExecutor() as ex:
+        list(ex.map(clean_player_stats_csv, file_paths, output_paths))
 
 if __name__ == "__main__":
     run_cleaning()
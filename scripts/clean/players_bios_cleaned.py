@@ -13,14 +13,24 @@ Clean NBA player roster → data/processed/players_bios_cleaned.csv
 """
 import os
 import re
+import sys
 import time
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from urllib.parse import urlparse
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
 import requests
 
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+
+from utils.clean_helpers import read_raw_csv  # noqa: E402
 
 RAW_DIR   = "data/raw/players"
 OUT_FPATH = "data/processed/player_bios_cleaned.csv"
@@ -29,7 +39,9 @@ SILHOUETTE_URL = "https://cdn.nba.com/headshots/nba/latest/1040x760/fallback.png
 HEADSHOT_CDN   = "https://cdn.nba.com/headshots/nba/latest/1040x760/{pid}.png"
 CHECK_CDN      = False          # set True to HEAD-check each CDN url (slower)
 
-API_URL = "https://stats.nba.com/stats/commonplayerinfo?PlayerID={pid}"
+API_URL     = "https://stats.nba.com/stats/commonplayerinfo?PlayerID={pid}"
+API_WORKERS = 8                 # concurrent requests for --api-fill
+API_RATE    = 5.0               # max requests started per second (stats.nba.com throttles)
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
@@ -46,7 +58,10 @@ HEADERS = {
 # ───────────────────────────────────────────────────────── helpers ─────────
 def _load(fname: str) -> pd.DataFrame:
     path = os.path.join(RAW_DIR, fname)
-    return pd.read_csv(path) if os.path.exists(path) else pd.DataFrame()
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    # Arrow parses blocks on all cores, with pandas' NA handling ("" / "NA" → NaN)
+    return read_raw_csv(path)
 
 
 def _clean_cols(df: pd.DataFrame) -> pd.DataFrame:
@@ -58,27 +73,21 @@ def _clean_cols(df: pd.DataFrame) -> pd.DataFrame:
 
 
 # ---------- basic parsers ----------
-def _height_to_in(v):
-    try:
-        ft, inch = map(int, str(v).split("-"))
-        return ft * 12 + inch
-    except:
-        return np.nan
+_height_re = re.compile(r"^\s*(\d+)\s*-\s*(\d+)\s*$")
+_weight_re = re.compile(r"(\d+)")
+_years_re  = re.compile(r"^\s*(\d+)(?:\s|$)")
 
 
-def _weight_to_lbs(v):
-    try:
-        m = re.search(r"\d+", str(v))
-        return float(m.group()) if m else np.nan
-    except:
-        return np.nan
-
-
-def _years(txt):
-    try:
-        return int(str(txt).split()[0])
-    except:
-        return np.nan
+def _parse_body(raw: pd.DataFrame) -> pd.DataFrame:
+    """'6-8' / '250lbs' / '5 Years' text → height (in), weight (lbs), experience (yrs)."""
+    ft_in = raw["height"].astype("string").str.extract(_height_re).astype(float)
+    return pd.DataFrame({
+        "height":     ft_in[0] * 12 + ft_in[1],
+        "weight":     raw["weight"].astype("string")
+                                   .str.extract(_weight_re, expand=False).astype(float),
+        "experience": raw["experience"].astype("string")
+                                       .str.extract(_years_re, expand=False).astype(float),
+    }, index=raw.index)
 
 
 # ---------- draft string splitter ----------
@@ -87,29 +96,23 @@ _draft_round = re.compile(r"(?:round|rnd)\s*(\d+)|\bR(\d+)\b", re.I)
 _draft_pick  = re.compile(r"(?:pick|#)\s*(\d+)", re.I)
 
 
-def _parse_draft(raw):
-    if not isinstance(raw, str) or not raw or "undrafted" in raw.lower():
-        return np.nan, np.nan, np.nan
-    year = _draft_year.search(raw)
-    rnd  = _draft_round.search(raw)
-    pick = _draft_pick.search(raw)
-    return (
-        int(year.group(1)) if year else np.nan,
-        int(next(g for g in rnd.groups() if g)) if rnd else np.nan,
-        int(pick.group(1)) if pick else np.nan,
+def _parse_draft(raw: pd.Series) -> pd.DataFrame:
+    """Split the raw draft strings into year / round / pick (NaN if undrafted)."""
+    raw = raw.astype("string")
+    undrafted = (
+        raw.isna() | raw.eq("") | raw.str.contains("undrafted", case=False, regex=False, na=True)
     )
+    rnd = raw.str.extract(_draft_round)
+    parts = pd.DataFrame({
+        "draft_year":  raw.str.extract(_draft_year, expand=False),
+        "draft_round": rnd[0].fillna(rnd[1]),
+        "draft_pick":  raw.str.extract(_draft_pick, expand=False),
+    })
+    return parts.astype(float).mask(undrafted)
 
 
-# ---------- pid extraction ----------
-_pid_url   = re.compile(r"/player/(\d+)/")
-_pid_query = re.compile(r"PlayerID=(\d+)", re.I)
-
-
-def _extract_pid(url: str | float) -> str | None:
-    """Return numeric Player-ID from profile_url, else None."""
-    s = str(url)
-    m = _pid_url.search(s) or _pid_query.search(s)
-    return m.group(1) if m else None
+# ---------- vectorised column parsers ----------
+_pid_re = re.compile(r"/player/(\d+)/|(?i:PlayerID=)(\d+)")
 
 
 def _fix_headshot(row) -> str:
@@ -123,7 +126,7 @@ def _fix_headshot(row) -> str:
     if url and url != "nan" and url != SILHOUETTE_URL:
         return url  # already good
 
-    if not pid:
+    if pd.isna(pid) or not pid:
         return SILHOUETTE_URL
 
     cdn = HEADSHOT_CDN.format(pid=pid)
@@ -137,49 +140,86 @@ def _fix_headshot(row) -> str:
         return cdn
 
 
+def _fix_headshots(rows: pd.DataFrame) -> list[str]:
+    """_fix_headshot for every row – the CDN HEAD checks run concurrently."""
+    with ThreadPoolExecutor(max_workers=API_WORKERS) as ex:
+        return list(ex.map(_fix_headshot, rows.to_dict("records")))
+
+
 # ---------- optional API back-fill ----------
+class _RateLimiter:
+    """Space out request starts so at most `rate` begin per second (thread-safe)."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+
 def api_backfill(df: pd.DataFrame) -> pd.DataFrame:
     miss = df["height"].isna() | df["weight"].isna() | df["experience"].isna()
-    todo = df[miss].copy()
+    todo = df.loc[miss, "pid"].dropna()
+    todo = todo[todo != ""]
     if todo.empty:
         print("API fill: nothing to fetch.")
         return df
 
     sess = requests.Session()
     sess.headers.update(HEADERS)
+    limiter = _RateLimiter(API_RATE)
     print(f"API fill: fetching {len(todo)} players …")
 
-    for idx, row in todo.iterrows():
-        pid = row["pid"]
-        if not pid:
-            continue
+    def fetch(pid: str) -> dict:
+        limiter.wait()
         try:
             js = sess.get(API_URL.format(pid=pid), timeout=8).json()
             data = dict(zip(
                 js["resultSets"][0]["headers"],
                 js["resultSets"][0]["rowSet"][0]
             ))
-            if pd.isna(df.at[idx, "height"]):
-                df.at[idx, "height"] = _height_to_in(data.get("HEIGHT"))
-            if pd.isna(df.at[idx, "weight"]):
-                df.at[idx, "weight"] = _weight_to_lbs(data.get("WEIGHT"))
-            if pd.isna(df.at[idx, "experience"]):
-                df.at[idx, "experience"] = _years(data.get("SEASON_EXP"))
-        except:
-            pass
-        time.sleep(0.2)
+        except Exception:
+            return {}
+        # raw text only – parsed in one vectorised pass once all calls return
+        return {
+            "height":     data.get("HEIGHT"),
+            "weight":     data.get("WEIGHT"),
+            "experience": data.get("SEASON_EXP"),
+        }
+
+    with ThreadPoolExecutor(max_workers=API_WORKERS) as ex:
+        results = list(ex.map(fetch, todo.tolist()))
+
+    raw = pd.DataFrame(results, index=todo.index, columns=["height", "weight", "experience"])
+    fetched = _parse_body(raw)
+    # SEASON_EXP is a number, not '5 Years' text – and a float one (5.0) as
+    # soon as a failed call leaves a gap in the column
+    fetched["experience"] = pd.to_numeric(raw["experience"], errors="coerce")
+    # only fill gaps – never overwrite values we already had
+    for col in fetched.columns:
+        df[col] = df[col].fillna(fetched[col])
     return df
 
 
 # ---------- Basketball-Reference-style short ID ----------
+_name_tokens = re.compile(r"^\s*(\S+)(?:\s+(\S+))?")
+
+
 def build_ids(df: pd.DataFrame) -> pd.Series:
-    prefixes = (
+    # first two name tokens only – avoids expanding one column per token
+    tokens = (
         df["player"].str.lower()
                      .str.replace(r"[^a-z ]", "", regex=True)
-                     .str.strip()
-                     .str.split(expand=True)
+                     .str.extract(_name_tokens)
     )
-    base = prefixes[1].fillna(prefixes[0]).str[:5] + prefixes[0].str[:2]
+    base = tokens[1].fillna(tokens[0]).str[:5] + tokens[0].str[:2]
     rank = base.groupby(base).cumcount().add(1).astype(str).str.zfill(2)
     return (base + rank).str.ljust(9, "0")
 
@@ -204,7 +244,7 @@ def main(merge=False, api_fill=False):
             on="profile_url", how="left"
         )
 
-    df = basic.copy()
+    df = basic
 
     # ---------- ensure core columns exist ----------
     for col in ("headshot_url", "birthdate", "experience", "draft"):
@@ -214,8 +254,20 @@ def main(merge=False, api_fill=False):
         df["is_retired"] = False
 
     # ---------- pid + headshot fix ----------
-    df["pid"] = df["profile_url"].apply(_extract_pid)
-    df["headshot_url"] = df.apply(_fix_headshot, axis=1)
+    m = df["profile_url"].astype("string").str.extract(_pid_re)
+    df["pid"] = m[0].fillna(m[1])
+    url = df["headshot_url"].astype("string").str.strip()
+    bad = url.isna() | url.isin(["", "nan", SILHOUETTE_URL])
+    if CHECK_CDN:
+        # HEAD-check only the rows that actually need a rebuilt url
+        df.loc[bad, "headshot_url"] = _fix_headshots(df.loc[bad])
+    else:
+        pid = df["pid"]
+        prefix, suffix = HEADSHOT_CDN.split("{pid}")
+        cdn_url = prefix + pid.astype("string") + suffix
+        df["headshot_url"] = np.where(
+            bad & pid.notna(), cdn_url, np.where(bad, SILHOUETTE_URL, url)
+        )
 
     # ---------- tidy strings ----------
     df["player"] = df["player"].astype(str).str.strip()
@@ -228,35 +280,26 @@ def main(merge=False, api_fill=False):
         df["position"] = (
             df["position"].astype(str).str.upper().str.strip().replace("", np.nan)
         )
+        # one tokenisation: primary / alternates are read off the same lists
         df["position_list"]    = df["position"].str.split(r"[-/,]", regex=True)
         df["position_primary"] = df["position_list"].str[0]
-        df["position_alt"]     = df["position_list"].apply(
-            lambda lst: "|".join(lst[1:]) if len(lst) > 1 else ""
-        )
+        df["position_alt"]     = df["position_list"].str[1:].str.join("|").fillna("")
     else:
         df["position_primary"] = np.nan
         df["position_alt"]     = ""
         df["position_list"]    = [[]] * len(df)
 
     # ---------- height / weight / experience ----------
-    if "height" in df:
-        df["height"] = df["height"].apply(_height_to_in)
-    else:
-        df["height"] = pd.Series([np.nan] * len(df)).apply(_height_to_in)
-    if "weight" in df:
-        df["weight"] = df["weight"].apply(_weight_to_lbs)
-    else:
-        df["weight"] = pd.Series([np.nan] * len(df)).apply(_weight_to_lbs)
-    if "experience" in df:
-        df["experience"] = df["experience"].apply(_years)
-    else:
-        df["experience"] = pd.Series([np.nan] * len(df)).apply(_years)
+    for col in ("height", "weight"):
+        if col not in df:
+            df[col] = np.nan
+    body = ["height", "weight", "experience"]
+    df[body] = _parse_body(df[body])
     df["birthdate"]  = pd.to_datetime(df["birthdate"], errors="coerce")
 
     # ---------- draft split ----------
     if "draft" in df.columns:
-        dv = df["draft"].apply(_parse_draft).tolist()
-        df[["draft_year", "draft_round", "draft_pick"]] = pd.DataFrame(dv, index=df.index)
+        df[["draft_year", "draft_round", "draft_pick"]] = _parse_draft(df["draft"])
         df["draft_status"] = np.where(df["draft_year"].isna(), "UDF", "Drafted")
         m1 = df["draft_status"].eq("Drafted") & df["draft_round"].isna()
         df.loc[m1, "draft_round"] = 1
@@ -277,10 +320,10 @@ def main(merge=False, api_fill=False):
         "draft_year", "draft_pick", "experience"
     ]
     present = [c for c in CORE if c in df.columns]
-    df["missing_core"] = (
-        df[present].isna() | df[present].astype(str).eq("")
-    ).sum(axis=1)
-    df = df[~(df["is_retired"] & (df["missing_core"] >= 4))].drop(columns="missing_core")
+    # only text columns can hold "" – numeric / date columns just count NaN
+    text = [c for c in present if df[c].dtype.kind == "O"]
+    missing_core = df[present].isna().sum(axis=1) + df[text].eq("").sum(axis=1)
+    df = df[~(df["is_retired"] & (missing_core >= 4))].copy()  # own frame: player_id is added next
 
     # ---------- unique player_id ----------
     df["player_id"] = build_ids(df)
@@ -297,6 +340,17 @@ def main(merge=False, api_fill=False):
     os.makedirs(os.path.dirname(OUT_FPATH), exist_ok=True)
     try:
         df.to_csv(OUT_FPATH, index=False)
+        # hive-partitioned Parquet dataset: readers can prune on is_retired
+        ds.write_dataset(
+            pa.Table.from_pandas(df, preserve_index=False),
+            os.path.splitext(OUT_FPATH)[0],
+            format="parquet",
+            partitioning=ds.partitioning(
+                pa.schema([pa.field("is_retired", pa.bool_())]), flavor="hive"
+            ),
+            file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+            existing_data_behavior="delete_matching",
+        )
     except PermissionError:
         raise SystemExit(f"⚠️  Close {OUT_FPATH} in other apps and run again.")
     print(f"✅ saved → {OUT_FPATH}  ({len(df):,} rows)")
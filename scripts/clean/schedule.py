@@ -2,10 +2,10 @@
 """
 generate_team_schedules.py
 
-For each season/team under:
-  data/processed/team_stats/box_scores/<SEASON>/teams/<TEAM>/
+For each season under:
+  data/processed/team_stats/box_scores/<SEASON>/
 
-Reads:
+Reads (once per season, then grouped by team):
   - regular_season_traditional.csv
   - playoffs_traditional.csv   (if present)
 
@@ -20,11 +20,19 @@ regular_season_schedule.csv columns:
 playoff_schedule.csv columns:
   GAME_ID, GAME_DATE, AWAY_TEAM, HOME_TEAM, ROUND, GAME_NO_IN_SERIES
 """
+from __future__ import annotations
+
+import sys
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
 # ─── Paths ─────────────────────────────────────────────────────────────
 ROOT        = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+
+from utils.clean_helpers import read_newest_copy
+
 BOX_BASE    = ROOT / "data" / "processed" / "team_stats" / "box_scores"
 SCHED_BASE  = ROOT / "data" / "processed" / "schedule"
 SCHED_BASE.mkdir(parents=True, exist_ok=True)
@@ -32,67 +40,90 @@ SCHED_BASE.mkdir(parents=True, exist_ok=True)
 # Map series index → round name
 ROUND_LABELS = {1: "RND1", 2: "SF", 3: "CONF", 4: "FINALS"}
 
+
+def _read_box(box_dir: Path, stem: str) -> pd.DataFrame | None:
+    """Newest box-score table written by the cleaner (.parquet or .csv), if any."""
+    try:
+        return read_newest_copy(box_dir / f"{stem}.csv", parse_dates=["game_date"])
+    except FileNotFoundError:
+        return None
+
+
+def _by_team(df: pd.DataFrame | None) -> dict[str, pd.DataFrame]:
+    """Split one season table into the per-team row sets the cleaner mirrors."""
+    if df is None or "team" not in df.columns:
+        return {}
+    return {
+        str(team).upper(): grp
+        for team, grp in df.groupby("team", observed=True)
+        if str(team)                                   # no "" team folder
+    }
+
+
+def _regular_season_schedule(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.sort_values("game_date").reset_index(drop=True)
+    df["GAME_WEEK"] = df.index + 1
+
+    return (
+        df[["game_id", "game_date", "away", "home", "GAME_WEEK"]]
+          .rename(columns={
+              "game_id":   "GAME_ID",
+              "game_date": "GAME_DATE",
+              "away":      "AWAY_TEAM",
+              "home":      "HOME_TEAM",
+          })
+    )
+
+
+def _playoff_schedule(df: pd.DataFrame, team_code: str) -> pd.DataFrame:
+    df = df.sort_values("game_date").reset_index(drop=True)
+
+    # determine opponent
+    away = df["away"].to_numpy()
+    df["OPPONENT"] = np.where(away == team_code, df["home"].to_numpy(), away)
+
+    # series groups: increment when opponent changes
+    df["SERIES_ID"] = (df["OPPONENT"] != df["OPPONENT"].shift()).cumsum()
+
+    # game number within that series
+    df["GAME_NO_IN_SERIES"] = df.groupby("SERIES_ID").cumcount() + 1
+
+    # map to round label (1→RND1, 2→SF, etc.)
+    df["ROUND"] = df["SERIES_ID"].map(ROUND_LABELS).fillna("UNKNOWN")
+
+    return (
+        df[["game_id", "game_date", "away", "home", "ROUND", "GAME_NO_IN_SERIES"]]
+          .rename(columns={
+              "game_id":           "GAME_ID",
+              "game_date":         "GAME_DATE",
+              "away":              "AWAY_TEAM",
+              "home":              "HOME_TEAM",
+              "GAME_NO_IN_SERIES": "GAME_NO_IN_SERIES",
+          })
+    )
+
+
 for season_dir in sorted(BOX_BASE.iterdir()):
-    teams_dir = season_dir / "teams"
-    if not teams_dir.is_dir():
+    if not season_dir.is_dir():
         continue
 
-    for team_dir in sorted(teams_dir.iterdir()):
-        if not team_dir.is_dir():
-            continue
+    # the teams/<TEAM>/ copies are row subsets of the season tables → read each
+    # season table once and group it, instead of re-reading ~30 team files
+    regular  = _by_team(_read_box(season_dir, "regular_season_traditional"))
+    playoffs = _by_team(_read_box(season_dir, "playoffs_traditional"))
 
-        out_dir = SCHED_BASE / season_dir.name / team_dir.name
+    for team_code in sorted(regular.keys() | playoffs.keys()):
+        out_dir = SCHED_BASE / season_dir.name / team_code
         out_dir.mkdir(parents=True, exist_ok=True)
 
         # ─── Regular Season ────────────────────────────────────────
-        reg = team_dir / "regular_season_traditional.csv"
-        if reg.exists():
-            df = pd.read_csv(reg, parse_dates=["game_date"])
-            df = df.sort_values("game_date").reset_index(drop=True)
-            df["GAME_WEEK"] = df.index + 1
-
-            sched = (
-                df[["game_id", "game_date", "away", "home", "GAME_WEEK"]]
-                  .rename(columns={
-                      "game_id":   "GAME_ID",
-                      "game_date": "GAME_DATE",
-                      "away":      "AWAY_TEAM",
-                      "home":      "HOME_TEAM",
-                  })
-            )
+        if team_code in regular:
+            sched = _regular_season_schedule(regular[team_code])
             sched.to_csv(out_dir / "regular_season_schedule.csv", index=False)
-            print(f"✅ {season_dir.name}/{team_dir.name} → regular_season_schedule.csv")
+            print(f"✅ {season_dir.name}/{team_code} → regular_season_schedule.csv")
 
         # ─── Playoffs ──────────────────────────────────────────────
-        ply = team_dir / "playoffs_traditional.csv"
-        if ply.exists():
-            df = pd.read_csv(ply, parse_dates=["game_date"])
-            df = df.sort_values("game_date").reset_index(drop=True)
-
-            # determine opponent
-            team_code = team_dir.name
-            df["OPPONENT"] = df.apply(
-                lambda r: r["home"] if r["away"] == team_code else r["away"], axis=1
-            )
-
-            # series groups: increment when opponent changes
-            df["SERIES_ID"] = (df["OPPONENT"] != df["OPPONENT"].shift()).cumsum()
-
-            # game number within that series
-            df["GAME_NO_IN_SERIES"] = df.groupby("SERIES_ID").cumcount() + 1
-
-            # map to round label (1→RND1, 2→SF, etc.)
-            df["ROUND"] = df["SERIES_ID"].map(ROUND_LABELS).fillna("UNKNOWN")
-
-            sched = (
-                df[["game_id", "game_date", "away", "home", "ROUND", "GAME_NO_IN_SERIES"]]
-                  .rename(columns={
-                      "game_id":           "GAME_ID",
-                      "game_date":         "GAME_DATE",
-                      "away":              "AWAY_TEAM",
-                      "home":              "HOME_TEAM",
-                      "GAME_NO_IN_SERIES": "GAME_NO_IN_SERIES",
-                  })
-            )
+        if team_code in playoffs:
+            sched = _playoff_schedule(playoffs[team_code], team_code)
             sched.to_csv(out_dir / "playoff_schedule.csv", index=False)
-            print(f"✅ {season_dir.name}/{team_dir.name} → playoff_schedule.csv")
+            print(f"✅ {season_dir.name}/{team_code} → playoff_schedule.csv")
@@ -15,33 +15,46 @@ For each file matching all_*_teams.csv, this script will:
   6. Split 'season' (e.g. "2024-25") into two ints:
        • season_start = 2024
        • season_end   = 2025
-  7. Drop duplicates and save to data/processed/awards/<stem>_cleaned.csv.
+  7. Drop duplicates and save to data/processed/awards/<stem>_cleaned.csv
+     (.parquet with PROCESSED_FORMAT=parquet).
+
+Steps 5–7 run once over all files together (one melt / split / dedupe);
+each output still holds only its own file's rows and columns.
 """
 
+import re
+import sys
 from pathlib import Path
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+
+from utils.clean_helpers import (  # noqa: E402
+    normalise_cols, processed_path, read_raw_csv, season_start_year,
+    write_processed,
+)
+
 RAW_DIR  = Path("data/raw/awards")
 PROC_DIR = Path("data/processed/awards")
 PROC_DIR.mkdir(parents=True, exist_ok=True)
 
-def clean_one_team_file(input_path: Path) -> None:
+# "<name> <pos>": the last space-separated token, if at most 2 characters long
+NAME_POS_RE = re.compile(r"(?s)^(.*) ([^ ]{1,2})$")
+
+# text fields trimmed + lower-cased in step 9
+TEXT_COLS = ["lg", "team_rank", "player", "player_name", "position", "award"]
+
+
+def load_team_file(input_path: Path) -> pd.DataFrame | None:
+    """Steps 1–4 for one file; None if it has no player slots to melt."""
     # 1) Load
-    df = pd.read_csv(input_path)
+    df = read_raw_csv(input_path)
     print(f"\n📥 Loaded {len(df):,} rows from {input_path.name}")
 
     # 2) Normalize column names to snake_case
     #    (strip, lowercase, replace spaces/punctuation with underscores)
-    df.columns = (
-        df.columns
-          .astype(str)
-          .str.strip()
-          .str.lower()
-          # replace any sequence of non-alphanumeric with underscore
-          .str.replace(r"[^\w]+", "_", regex=True)
-          # remove leading/trailing underscores
-          .str.strip("_")
-    )
+    df.columns = normalise_cols(df.columns)
 
     # 3) Rename 'tm' → 'team_rank'; drop 'voting'
     if "tm" in df.columns:
@@ -53,18 +66,37 @@ def clean_one_team_file(input_path: Path) -> None:
     unnamed_cols = [c for c in df.columns if c.startswith("unnamed")]
     if not unnamed_cols:
         print("   • No 'unnamed' columns found—nothing to melt.")
-        return
+        return None
 
     print(f"   • Found {len(unnamed_cols)} unnamed columns: {unnamed_cols}")
+    if "season" not in df.columns:
+        print("   • No 'season' column to split.")
+    # slot position, not header text, so every file's slots line up in the concat
+    return df.rename(columns={c: f"_slot_{i}" for i, c in enumerate(unnamed_cols)})
+
+
+def clean_team_files(input_paths: list[Path]) -> None:
+    """
+    Load every file, then run melt / split / season / trim / dedupe once over
+    all of them and write one cleaned table per source file.
+    """
+    frames = {}
+    for path in input_paths:
+        df = load_team_file(path)
+        if df is not None:
+            frames[path.stem] = df
+    if not frames:
+        return
 
-    # 5) Melt them into one 'player' column
-    #    Keep id_vars = all other columns except unnamed_cols
-    id_vars = [c for c in df.columns if c not in unnamed_cols]
+    # 5) Melt the player slots into one 'player' column
+    #    Keep id_vars = all other columns except the slots (+ the source file)
+    big = pd.concat(frames, names=["_src", None]).reset_index(level=0)
+    slots = [c for c in big.columns if c.startswith("_slot_")]
     df_long = (
-        df
+        big
         .melt(
-            id_vars=id_vars,
-            value_vars=unnamed_cols,
+            id_vars=[c for c in big.columns if c not in slots],
+            value_vars=slots,
             var_name="member_rank",
             value_name="player"
         )
@@ -73,68 +105,53 @@ def clean_one_team_file(input_path: Path) -> None:
         .drop(columns=["member_rank"])
         .reset_index(drop=True)
     )
-    print(f"   • After melting: {len(df_long):,} rows (one per player)")
 
     # 6) Parse 'player' into 'player_name' and 'position'
-    #    We assume the last token is the position (e.g. "C", "F", "G")
-    def split_name_pos(x):
-        parts = x.rsplit(" ", 1)
-        if len(parts) == 2 and len(parts[1]) <= 2:
-            return parts[0], parts[1]
-        else:
-            return x, None  # fallback: put whole string in name, no position
-    df_long[["player_name", "position"]] = df_long["player"].apply(
-        lambda x: pd.Series(split_name_pos(x.strip()))
-    )
+    #    We assume the last token is the position (e.g. "C", "F", "G");
+    #    one regex pass over the whole column instead of a Series per row
+    player = df_long["player"].str.strip()
+    parts  = player.str.extract(NAME_POS_RE)
+    # fallback: whole string as the name, no position
+    df_long["player_name"] = parts[0].fillna(player)
+    df_long["position"]    = parts[1]
 
     # 7) Add 'award' column (override or supplement existing)
-    award_name = input_path.stem.lower()  # e.g. 'all_league_teams'
-    df_long["award"] = award_name
+    df_long["award"] = df_long["_src"].str.lower()  # e.g. 'all_league_teams'
 
     # 8) Convert 'season' → season_start & season_end
     if "season" in df_long.columns:
-        # season is a string like "2024-25"
-        df_long["season_start"] = (
-            df_long["season"]
-            .astype(str)
-            .str.slice(0, 4)
-            .astype(int, errors="ignore")
-        )
-        # If season_end is literally "25", convert to 2025
-        def compute_end(x):
-            txt = str(x).strip()
-            if "-" in txt:
-                # e.g. "2024-25" → tail is "25"
-                end_part = txt.split("-")[-1]
-                try:
-                    end_year = int(end_part)
-                    # If end_part is two digits, prepend first two digits of start
-                    if len(end_part) == 2:
-                        prefix = txt[:2]  # "20"
-                        return int(prefix + end_part)
-                    return end_year
-                except:
-                    return None
-            return None
-        df_long["season_end"] = df_long["season"].apply(compute_end)
-    else:
-        print("   • No 'season' column to split.")
+        # season is a string like "2024-25": both bounds come from the
+        # start year, so "1999-00" ends in 2000, not 1900
+        df_long["season_start"] = season_start_year(df_long["season"]).astype("Int64")
+        df_long["season_end"]   = df_long["season_start"] + 1
 
     # 9) Trim whitespace on text fields
-    for col in ["lg", "team_rank", "player", "player_name", "position", "award"]:
+    for col in TEXT_COLS:
         if col in df_long.columns:
             df_long[col] = df_long[col].astype(str).str.strip().str.lower()
 
-    # 10) Drop exact duplicates
-    before = len(df_long)
-    df_long = df_long.drop_duplicates().reset_index(drop=True)
-    dropped = before - len(df_long)
-    print(f"   • Dropped {dropped:,} duplicates → {len(df_long):,} rows remain")
+    # 10) Drop exact duplicates (rows of different files never match: own _src)
+    df_long = df_long.drop_duplicates()
+
+    # 11) Save one cleaned table per file (CSV, or Parquet with PROCESSED_FORMAT=parquet)
+    for stem, rows in df_long.groupby("_src", sort=False):
+        src = frames[stem]
+        # back to this file's own columns and dtypes (the concat widened both)
+        id_cols = [c for c in src.columns if not c.startswith("_slot_")]
+        added = ["player", "player_name", "position", "award"]
+        if "season" in id_cols:
+            added += ["season_start", "season_end"]
+        # a column the file already had (e.g. award) was overwritten in place
+        cols = id_cols + [c for c in added if c not in id_cols]
+        out = rows[cols].astype(
+            {c: src[c].dtype for c in id_cols if c not in TEXT_COLS and c != "season"}
+        ).reset_index(drop=True)
+        print(f"   • {stem}: {len(out):,} rows (one per player, duplicates dropped)")
+
+        output_path = processed_path(PROC_DIR / f"{stem}_cleaned.csv")   # PROCESSED_FORMAT
+        write_processed(out, output_path)
+        print(f"✅ Wrote cleaned file to {output_path.name}")
 
-    # 11) Save cleaned CSV
-    output_path = PROC_DIR / f"{input_path.stem}_cleaned.csv"
-    df_long.to_csv(output_path, index=False)
-    print(f"✅ Wrote cleaned file to {output_path.name}")
 
 if __name__ == "__main__":
     # Find every all_*_teams.csv in data/raw/awards
@@ -145,5 +162,4 @@ if __name__ == "__main__":
         print(f"⚠️  No files matching {pattern} in {RAW_DIR}")
         exit(0)
 
-    for fpath in csv_files:
-        clean_one_team_file(fpath)
+    clean_team_files(csv_files)
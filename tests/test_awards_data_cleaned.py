@@ -0,0 +1,40 @@
+import importlib.util
+from pathlib import Path
+
+import utils.clean_helpers as clean_helpers
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_cleaner():
+    path = ROOT / "scripts" / "clean" / "awards_data_cleaned.py"
+    spec = importlib.util.spec_from_file_location("awards_data_cleaned", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+HEADER = "Season,Lg,Player,Age,Tm,G,PTS,Voting\n"
+
+
+def test_blank_in_one_file_does_not_widen_another(tmp_path, monkeypatch):
+    monkeypatch.setattr(clean_helpers, "PROCESSED_FORMAT", "csv")
+    cleaner = _load_cleaner()
+
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    (raw / "roty.csv").write_text(HEADER + "2023-24,NBA,Victor W,20,,71,21.4,(V)\n")
+    # same header, but a blank age → this file's age column is float
+    (raw / "mip.csv").write_text(HEADER + "2023-24,NBA,Coby W,,ATL,78,15.1,(V)\n")
+
+    out = tmp_path / "out"
+    cleaner.clean_all_awards(raw, out)
+
+    roty = (out / "roty_cleaned.csv").read_text()
+    assert "2023-24,NBA,Victor W,20,FA,71,21.4,roty,2023,2024" in roty
+
+    # grouped output == a single-file clean of each file
+    for stem in ("roty", "mip"):
+        single = tmp_path / f"{stem}_single.csv"
+        cleaner.clean_award_csv(raw / f"{stem}.csv", single, stem)
+        assert (out / f"{stem}_cleaned.csv").read_bytes() == single.read_bytes()
@@ -0,0 +1,122 @@
+import importlib.util
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import utils.clean_helpers as clean_helpers
+from utils.clean_helpers import code_slices, csv_row_lines, season_start_year
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_cleaner(name):
+    path = ROOT / "scripts" / "clean" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_season_start_year():
+    season = pd.Series(["2024-25", "1999-00", "2024-25", None, "abcd-ef", "24-25"],
+                       index=[10, 11, 12, 13, 14, 15])
+    out = season_start_year(season)
+    assert out.index.tolist() == season.index.tolist()
+    assert out.iloc[:3].tolist() == [2024, 1999, 2024]
+    assert out.iloc[3:].isna().all()
+
+
+def test_code_slices_groups_in_row_order():
+    codes = np.array([2, 0, -1, 2, 0, 1, -1])
+    slices = {code: idx.tolist() for code, idx in code_slices(codes)}
+    assert slices == {0: [1, 4], 1: [5], 2: [0, 3]}         # -1 (missing) skipped
+    assert list(code_slices(np.array([], dtype=np.int64))) == []
+
+
+def test_csv_row_lines_match_to_csv():
+    df = pd.DataFrame({
+        "team":  ["LAL", "B,OS", None, 'say "hi"'],
+        "pts":   [101, 99, 0, 87],
+        "pct":   [0.5, np.nan, 1 / 3, 0.25],
+        "date":  pd.to_datetime(["2024-10-22", None, "2025-01-01", "2025-02-03"]),
+    })
+    header, lines = csv_row_lines(df)
+    assert header + "".join(lines) == df.to_csv(index=False)
+    # any row subset renders like to_csv of that subset
+    idx = [3, 0]
+    assert header + "".join(lines[idx]) == df.iloc[idx].to_csv(index=False)
+
+
+def test_csv_row_lines_rejects_multiline_fields():
+    assert csv_row_lines(pd.DataFrame({"note": ["one\ntwo", "three"]})) is None
+
+
+RAW = (
+    "PLAYER_NAME,TEAM_ABBREVIATION,SEASON_YEAR,PTS\n"
+    "A One,LAL,2024-25,10\n"
+    "B Two,BOS,2024-25,20\n"
+    "C Three,LAL,2024-25,30\n"
+)
+
+
+def _past(path, seconds=100):
+    old = path.stat().st_mtime - seconds
+    os.utime(path, (old, old))
+
+
+def test_fresh_master_with_missing_team_copy_is_repaired(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(clean_helpers, "PROCESSED_FORMAT", "csv")
+    cleaner = _load_cleaner("clean_player_general")
+
+    src = tmp_path / "raw" / "totals" / "regular_season.csv"
+    src.parent.mkdir(parents=True)
+    src.write_text(RAW)
+    _past(src)
+    master = tmp_path / "proc" / "totals" / "regular_season.csv"
+    team_root = tmp_path / "proc" / "teams"
+    lal = team_root / "LAL" / "totals" / "regular_season.csv"
+    bos = team_root / "BOS" / "totals" / "regular_season.csv"
+
+    cleaner._clean_one(src, master, team_root, force=False)
+    assert lal.read_text().count("\n") == 3 and bos.read_text().count("\n") == 2
+
+    # every output fresh → skipped without re-reading the raw file
+    capsys.readouterr()
+    cleaner._clean_one(src, master, team_root, force=False)
+    assert "up to date" in capsys.readouterr().out
+
+    # a missing team copy is rebuilt; the fresh master is left alone
+    expected = bos.read_bytes()
+    master_mtime = master.stat().st_mtime
+    bos.unlink()
+    cleaner._clean_one(src, master, team_root, force=False)
+    assert "up to date" not in capsys.readouterr().out
+    assert bos.read_bytes() == expected
+    assert master.stat().st_mtime == master_mtime
+
+    # a copy older than the raw file is stale and rewritten too
+    expected = lal.read_bytes()
+    lal.write_text("stale\n")
+    _past(lal, 1000)
+    cleaner._clean_one(src, master, team_root, force=False)
+    assert lal.read_bytes() == expected
+
+
+def test_write_table_keeps_fresh_and_rewrites_stale(tmp_path, monkeypatch):
+    monkeypatch.setattr(clean_helpers, "PROCESSED_FORMAT", "csv")
+    src = tmp_path / "raw.csv"
+    src.write_text("x\n1\n")
+    _past(src)
+    out = tmp_path / "out" / "t.csv"
+
+    clean_helpers.write_table(out, "new\n", force=False, src=src)
+    assert out.read_text() == "new\n"
+    clean_helpers.write_table(out, "other\n", force=False, src=src)
+    assert out.read_text() == "new\n"                        # fresh → kept
+    clean_helpers.write_table(out, "forced\n", force=True, src=src)
+    assert out.read_text() == "forced\n"
+    _past(out, 1000)
+    clean_helpers.write_table(out, "rebuilt\n", force=False, src=src)
+    assert out.read_text() == "rebuilt\n"                    # stale → rewritten
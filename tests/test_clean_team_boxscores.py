@@ -0,0 +1,47 @@
+import importlib.util
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_cleaner():
+    path = ROOT / "scripts" / "clean" / "clean_team_boxscores.py"
+    spec = importlib.util.spec_from_file_location("clean_team_boxscores", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_matchup_regex_splits_both_separators():
+    cleaner = _load_cleaner()
+    assert cleaner._MATCHUP_RE.match("LAL vs. BOS").groups() == ("LAL", "vs.", "BOS")
+    assert cleaner._MATCHUP_RE.match("LAL @ BOS").groups() == ("LAL", "@", "BOS")
+    assert cleaner._MATCHUP_RE.match("LAL").groups() == ("LAL", None, None)
+
+
+def test_derive_home_away_flips_road_rows():
+    cleaner = _load_cleaner()
+    df = pd.DataFrame({"matchup": ["LAL vs. BOS", "LAL @ BOS", "BOS  vs.  LAL", "LAL vs. BOS"]})
+    cleaner._derive_home_away(df)
+    assert df["is_home"].tolist() == [True, False, True, True]
+    assert df["home"].tolist() == ["LAL", "BOS", "BOS", "LAL"]
+    assert df["away"].tolist() == ["BOS", "LAL", "LAL", "BOS"]
+
+
+def test_derive_home_away_missing_opponent():
+    cleaner = _load_cleaner()
+    # no separator → the whole string is the team, treated as a road row
+    df = pd.DataFrame({"matchup": ["LAL", None]})
+    cleaner._derive_home_away(df)
+    assert df["is_home"].tolist() == [False, False]
+    assert df["away"].iloc[0] == "LAL"
+    assert df["home"].isna().all() and pd.isna(df["away"].iloc[1])
+
+
+def test_derive_home_away_without_matchup_is_a_no_op():
+    cleaner = _load_cleaner()
+    df = pd.DataFrame({"team": ["LAL"]})
+    cleaner._derive_home_away(df)
+    assert list(df.columns) == ["team"]
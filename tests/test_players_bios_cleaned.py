@@ -0,0 +1,93 @@
+import importlib.util
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_cleaner():
+    path = ROOT / "scripts" / "clean" / "players_bios_cleaned.py"
+    spec = importlib.util.spec_from_file_location("players_bios_cleaned", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class _FakeResponse:
+    def __init__(self, row):
+        self._row = row
+
+    def json(self):
+        if self._row is None:
+            raise ValueError("no JSON")
+        return {"resultSets": [{"headers": ["HEIGHT", "WEIGHT", "SEASON_EXP"],
+                                "rowSet": [self._row]}]}
+
+
+class _FakeSession:
+    rows = {
+        "1": ["6-8", "250", 5],
+        "2": None,                      # failed call → fetch returns {}
+        "3": ["7-0", "240", 12],
+    }
+
+    def __init__(self):
+        self.headers = {}
+
+    def get(self, url, timeout):
+        return _FakeResponse(self.rows[url.rsplit("=", 1)[1]])
+
+
+def test_failed_fetch_keeps_experience_of_the_others(monkeypatch):
+    cleaner = _load_cleaner()
+    monkeypatch.setattr(cleaner.requests, "Session", _FakeSession)
+    monkeypatch.setattr(cleaner, "API_RATE", 1000.0)
+
+    df = pd.DataFrame({
+        "pid":        ["1", "2", "3"],
+        "height":     [float("nan")] * 3,
+        "weight":     [float("nan")] * 3,
+        "experience": [float("nan"), 3.0, float("nan")],
+    })
+    out = cleaner.api_backfill(df)
+
+    assert out["height"].tolist()[::2] == [80.0, 84.0]
+    assert out["weight"].tolist()[::2] == [250.0, 240.0]
+    assert out["experience"].tolist() == [5.0, 3.0, 12.0]
+    assert out[["height", "weight"]].iloc[1].isna().all()
+
+
+
+def test_parse_body_text_fields():
+    cleaner = _load_cleaner()
+    raw = pd.DataFrame({
+        "height":     ["6-8", " 7 - 0 ", None, "tall"],
+        "weight":     ["250lbs", "240", None, "n/a"],
+        "experience": ["5 Years", "R", None, "12"],
+    })
+    out = cleaner._parse_body(raw)
+    assert out["height"].tolist()[:2] == [80.0, 84.0]
+    assert out["weight"].tolist()[:2] == [250.0, 240.0]
+    assert out["experience"].iloc[[0, 3]].tolist() == [5.0, 12.0]
+    assert out.iloc[2].isna().all()
+    assert pd.isna(out["experience"].iloc[1]) and out.iloc[3, :2].isna().all()
+
+
+def test_parse_draft_year_round_pick():
+    cleaner = _load_cleaner()
+    raw = pd.Series(["2003 Round 1 Pick 1", "2019 R2 #15", "2010 Rnd 2, Pick 45",
+                     "Undrafted", "", None])
+    out = cleaner._parse_draft(raw)
+    assert out.iloc[:3].values.tolist() == [[2003, 1, 1], [2019, 2, 15], [2010, 2, 45]]
+    # undrafted / blank / missing → all NaN (main() turns those into UDF zeros)
+    assert out.iloc[3:].isna().all().all()
+
+
+def test_pid_from_either_url_form():
+    cleaner = _load_cleaner()
+    urls = pd.Series(["https://www.nba.com/player/2544/lebron-james",
+                      "https://stats.nba.com/player?PlayerID=203999", "n/a"])
+    m = urls.astype("string").str.extract(cleaner._pid_re)
+    assert m[0].fillna(m[1]).tolist()[:2] == ["2544", "203999"]
+    assert m.iloc[2].isna().all()
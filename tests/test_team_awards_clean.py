@@ -0,0 +1,60 @@
+import importlib.util
+from pathlib import Path
+
+import utils.clean_helpers as clean_helpers
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_cleaner():
+    path = ROOT / "scripts" / "clean" / "team_awards_clean.py"
+    spec = importlib.util.spec_from_file_location("team_awards_clean", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _write_raw(tmp_path):
+    raw = tmp_path / "data" / "raw" / "awards"
+    raw.mkdir(parents=True)
+    (raw / "all_nba_teams.csv").write_text(
+        "Season,Lg,Tm,Voting,,,\n"
+        "2023-24,NBA,1st,,Nikola Jokić C,Luka Dončić G\n"
+        "2022-23,NBA,2nd,,Jimmy Butler F,\n"
+    )
+    # this file already carries an award column
+    (raw / "all_defense_teams.csv").write_text(
+        "Season,Lg,Tm,Award,,\n"
+        "2023-24,NBA,1st,DPOY list,Rudy Gobert C\n"
+    )
+    return sorted(raw.glob("all_*_teams.csv"))
+
+
+def test_melt_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(clean_helpers, "PROCESSED_FORMAT", "csv")
+    monkeypatch.chdir(tmp_path)                     # PROC_DIR is relative
+    cleaner = _load_cleaner()
+    paths = _write_raw(tmp_path)
+
+    cleaner.clean_team_files(paths)
+    out = tmp_path / "data" / "processed" / "awards"
+
+    # one row per filled slot; blank slots dropped; name / position split
+    assert (out / "all_nba_teams_cleaned.csv").read_text() == (
+        "season,lg,team_rank,player,player_name,position,award,season_start,season_end\n"
+        "2023-24,nba,1st,nikola jokić c,nikola jokić,c,all_nba_teams,2023,2024\n"
+        "2022-23,nba,2nd,jimmy butler f,jimmy butler,f,all_nba_teams,2022,2023\n"
+        "2023-24,nba,1st,luka dončić g,luka dončić,g,all_nba_teams,2023,2024\n"
+    )
+    # an existing award column is overwritten in place, not repeated
+    assert (out / "all_defense_teams_cleaned.csv").read_text() == (
+        "season,lg,team_rank,award,player,player_name,position,season_start,season_end\n"
+        "2023-24,nba,1st,all_defense_teams,rudy gobert c,rudy gobert,c,2023,2024\n"
+    )
+
+    # grouped output == a single-file clean of each file
+    grouped = {p.name: p.read_bytes() for p in out.iterdir()}
+    for path in paths:
+        cleaner.clean_team_files([path])
+        name = f"{path.stem}_cleaned.csv"
+        assert (out / name).read_bytes() == grouped[name]
@@ -1,6 +1,20 @@
 # utils/clean_helpers.py
+import os
 import re
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Output format for processed tables: "csv" (default) or "parquet" (snappy).
+# Set the PROCESSED_FORMAT environment variable to switch.
+PROCESSED_FORMAT = os.environ.get("PROCESSED_FORMAT", "csv").lower()
 
 def normalise_cols(cols: pd.Index) -> pd.Index:
     """
@@ -10,20 +24,302 @@ def normalise_cols(cols: pd.Index) -> pd.Index:
     • Replace "%" → "_pct" before or after as needed
     • Collapse multiple underscores into one
     • Strip leading/trailing underscores
+
+    Raw CSVs of one scraper share a header, so results are cached per
+    tuple of column names.
+    """
+    return pd.Index(_normalise_names(tuple(cols)))
+
+
+_SYMBOLS     = str.maketrans({"%": "_pct", "/": "_"})
+_NON_WORD    = re.compile(r"[^\w]+")
+_UNDERSCORES = re.compile(r"_+")
+
+@lru_cache(maxsize=None)
+def _normalise_names(names: tuple) -> tuple:
+    # a header is a handful of short names: plain str methods and the two
+    # precompiled patterns, no intermediate Index per step
+    out = []
+    for name in names:
+        # 1) Trim & lowercase;  2) "%" → "_pct";  3) "/" → "_"
+        name = str(name).strip().lower().translate(_SYMBOLS)
+        # 4) remaining non‐alphanumeric → "_";  5) collapse "_" runs;  6) strip "_"
+        out.append(_UNDERSCORES.sub("_", _NON_WORD.sub("_", name)).strip("_"))
+    return tuple(out)
+
+
+def season_start_year(season: pd.Series) -> pd.Series:
+    """
+    Numeric start year of every "YYYY-YY" season value (NaN if unparseable).
+    A season repeats on every row of a table, so each distinct value is
+    parsed once and the result is expanded back onto the rows by its
+    factorize code.
+    """
+    codes, uniq = pd.factorize(season)              # NaN → code -1
+    # fixed-width prefix: a slice + digit test instead of a regex match
+    head = pd.Series(uniq, dtype=object).astype(str).str.slice(0, 4)
+    years = pd.to_numeric(
+        head.where(head.str.len().eq(4) & head.str.isdigit()), errors="coerce"
+    )
+    # expand by code: -1 is not a label, so missing seasons come back NaN
+    return years.reindex(codes).set_axis(season.index)
+
+
+def upper_labels(s: pd.Series) -> pd.Series:
+    """
+    `s.fillna("").astype(str).str.upper()` for a low-cardinality label
+    column (team codes / names): the string ops run once per distinct
+    value and the result is expanded back onto the rows by its code.
+    """
+    codes, uniq = pd.factorize(s)                   # NaN → code -1
+    labels = pd.Series(uniq, dtype=object).astype(str).str.upper()
+    return labels.reindex(codes).fillna("").set_axis(s.index)
+
+
+def code_slices(codes: np.ndarray):
+    """
+    Yield (code, row positions) for every distinct code >= 0; -1 marks a
+    missing key and is skipped. One stable argsort, then the contiguous runs
+    of the sorted codes – no per-row hashing, and rows keep their order.
+    """
+    if len(codes) == 0:
+        return
+    order = np.argsort(codes, kind="stable")
+    ordered = codes[order]
+    for run in np.split(order, np.flatnonzero(ordered[1:] != ordered[:-1]) + 1):
+        if codes[run[0]] >= 0:
+            yield codes[run[0]], run
+
+
+def standardise_team_abbrev(df: pd.DataFrame) -> None:
+    """Rename team_abbreviation → team and force upper-case (in place)."""
+    if "team_abbreviation" in df.columns:
+        df.rename(columns={"team_abbreviation": "team"}, inplace=True)
+    if "team" in df.columns:
+        df["team"] = upper_labels(df["team"])
+
+SEASON_BOUNDS = ["season_start", "season_end"]    # columns added by add_season_bounds
+
+def add_season_bounds(df: pd.DataFrame) -> None:
+    """Rename season_year → season and add numeric season_start / season_end (in place)."""
+    if "season_year" in df.columns:
+        df.rename(columns={"season_year": "season"}, inplace=True)
+    if "season" in df.columns:
+        df["season_start"] = season_start_year(df["season"])
+        df["season_end"]   = df["season_start"] + 1
+
+
+def dedupe_raw_rows(df: pd.DataFrame, derived: list[str]) -> None:
+    """
+    Drop duplicate rows (in place), comparing only the columns read from the
+    raw file: the `derived` ones the cleaner added are computed from those,
+    so they never tell two rows apart.
+    """
+    df.drop_duplicates(subset=df.columns.difference(derived), inplace=True)
+
+
+def read_raw_csv(path: Path, dtype: dict | None = None) -> pd.DataFrame:
     """
-    # 1) Trim & lowercase
-    cols = cols.str.strip().str.lower()
-    # 2) Replace "%" with "_pct"
-    cols = cols.str.replace("%", "_pct", regex=False)
-    # 3) Replace "/" with "_"
-    cols = cols.str.replace("/", "_", regex=False)
-    # 4) Replace any remaining non‐alphanumeric with "_"
-    cols = cols.str.replace(r"[^\w]+", "_", regex=True)
-    # 5) Collapse multiple underscores → single "_"
-    cols = cols.str.replace(r"_+", "_", regex=True)
-    # 6) Strip leading/trailing underscores
-    cols = cols.str.replace(r"^_|_$", "", regex=True)
-    return cols
+    Multi-threaded Arrow parse of a raw CSV into the usual pandas dtypes;
+    pandas' C parser if Arrow rejects the file or its header has blank or
+    repeated names (Arrow keeps those as-is, pandas makes them unique as
+    "Unnamed: n" / "X.1").
+    """
+    try:
+        df = pd.read_csv(path, engine="pyarrow", dtype=dtype)
+        if not (df.columns.has_duplicates or (df.columns == "").any()):
+            return df
+    except ValueError:                   # pyarrow.ArrowInvalid subclasses it
+        pass
+    return pd.read_csv(path, dtype=dtype, low_memory=False)
+
+
+def csv_files(directory: Path) -> list[Path]:
+    """*.csv files directly inside `directory` ([] if it does not exist)."""
+    if not directory.is_dir():
+        return []
+    # scandir entries carry name + type from the directory read itself, and a
+    # plain suffix test replaces glob's fnmatch per entry
+    with os.scandir(directory) as it:
+        return [Path(e.path) for e in it if e.name.endswith(".csv") and e.is_file()]
+
+
+def subdir_names(directory: Path) -> list[str]:
+    """Sorted names of the sub-folders of `directory` ([] if it does not exist)."""
+    if not directory.is_dir():
+        return []
+    # DirEntry.is_dir() uses the type the directory read returned – no stat per entry
+    with os.scandir(directory) as it:
+        return sorted(e.name for e in it if e.is_dir())
+
+
+_DIRS_MADE: set[Path] = set()        # output folders already created by this process
+
+def ensure_dir(directory: Path) -> None:
+    """`mkdir -p directory`, issued at most once per folder per process."""
+    if directory not in _DIRS_MADE:
+        directory.mkdir(parents=True, exist_ok=True)
+        _DIRS_MADE.add(directory)
+
 
+def is_fresh(src: Path, dst: Path) -> bool:
+    """True if `dst` exists and was written no earlier than `src` last changed."""
+    try:
+        return dst.stat().st_mtime >= src.stat().st_mtime
+    except FileNotFoundError:
+        return False
 
 
+def processed_path(path: Path) -> Path:
+    """`path` with the file suffix of the configured PROCESSED_FORMAT."""
+    return path.with_suffix(".parquet" if PROCESSED_FORMAT == "parquet" else ".csv")
+
+def _mtime(path: Path) -> float:
+    """Last write time of a file, or of the newest part file in a dataset directory."""
+    if path.is_dir():
+        return max((f.stat().st_mtime for f in path.rglob("*.parquet")), default=0.0)
+    return path.stat().st_mtime
+
+
+def read_newest_copy(csv_path: Path, columns: list[str] | None = None,
+                     **csv_kwargs) -> pd.DataFrame:
+    """
+    Read the newest copy of a cleaned table: a partitioned Parquet dataset
+    directory (<stem>/), a single <stem>.parquet or the CSV. The typed
+    Parquet copy wins a tie, but a leftover one from an earlier run never
+    shadows a freshly rebuilt CSV. *columns* limits the read; *csv_kwargs*
+    go to read_csv only. FileNotFoundError if there is no copy at all.
+    """
+    candidates = [
+        path
+        for path in (csv_path.with_suffix(""), csv_path.with_suffix(".parquet"), csv_path)
+        if path.exists()
+    ]
+    if not candidates:
+        raise FileNotFoundError(f"No cleaned table found for {csv_path}")
+    newest = max(candidates, key=_mtime)             # first of equals → Parquet
+    if newest == csv_path:
+        return pd.read_csv(csv_path, usecols=columns, **csv_kwargs)
+    return pd.read_parquet(newest, columns=columns)
+
+
+def csv_row_lines(df: pd.DataFrame) -> tuple[str, np.ndarray] | None:
+    """
+    Render `df` as CSV once → (header line, one formatted line per row).
+    The CSV text of any row subset is then `header + "".join(lines[idx])`,
+    so a table and its split copies share a single formatting pass.
+    None if a quoted field spans lines (rows and lines no longer line up).
+    """
+    lines = df.to_csv(index=False).splitlines(keepends=True)
+    if len(lines) != len(df) + 1:
+        return None
+    return lines[0], np.array(lines[1:], dtype=object)
+
+
+def write_processed(df: pd.DataFrame | str, path: Path, *, overwrite: bool = True) -> None:
+    """
+    Write `df` as snappy Parquet or CSV, depending on the suffix of `path`.
+    `df` may also be CSV text already rendered via csv_row_lines.
+    With overwrite=False the file is created exclusively (O_EXCL) and
+    FileExistsError is raised if it is already there – the existence check
+    and the create are one open() call.
+    """
+    mode = "w" if overwrite else "x"
+    if isinstance(df, str):
+        with open(path, mode, encoding="utf-8", newline="") as fh:
+            fh.write(df)
+    elif path.suffix == ".parquet":
+        with open(path, mode + "b") as fh:
+            df.to_parquet(fh, engine="pyarrow", compression="snappy", index=False)
+    else:
+        df.to_csv(path, index=False, mode=mode)
+
+
+WRITE_THREADS = 8          # concurrent split-file writes within one cleaner worker
+
+
+def up_to_date(src: Path, dst: Path,
+               copies: Callable[[Path], Iterable[Path]] | None = None) -> bool:
+    """
+    True – and the file is reported as skipped – if the processed output of
+    `dst` was written no earlier than its raw file `src` last changed, so a
+    cleaner run without -f need not re-parse it. `copies(master)` lists the
+    split copies made from that output; each of them has to be there and
+    fresh as well.
+    """
+    master = processed_path(dst)
+    if not is_fresh(src, master):
+        return False
+    if copies is not None and not all(is_fresh(src, p) for p in copies(master)):
+        return False
+    print(f"⏭️  {src.name}: up to date — skipped (use -f to rebuild)")
+    return True
+
+
+def read_processed_columns(path: Path, columns: list[str]) -> pd.DataFrame:
+    """
+    Just those of `columns` that the processed table `path` has – enough to
+    list its split copies without loading the rest. CSV values come back as
+    text, with blanks kept as "".
+    """
+    if path.suffix == ".parquet":
+        names = set(pq.read_schema(path).names)
+        return pd.read_parquet(path, columns=[c for c in columns if c in names])
+    return pd.read_csv(path, usecols=lambda c: c in columns, dtype=str,
+                       keep_default_na=False)
+
+
+def _partition_file(out_dir: Path, by: str, value) -> Path:
+    # Arrow URI-escapes hive partition values in the folder name
+    return out_dir / f"{by}={quote(str(value), safe='')}" / "part-0.parquet"
+
+
+def split_copies(values: pd.Series, by: str, dataset: Path,
+                 csv_copy: Callable[[object], Path]) -> list[Path]:
+    """
+    Output files of a split on key `by` with the given per-row `values`:
+    the partitions of the hive dataset `dataset` for Parquet output,
+    csv_copy(value) per distinct value for CSV.
+    """
+    keys = pd.unique(values.dropna())
+    if PROCESSED_FORMAT == "parquet":
+        return [_partition_file(dataset, by, k) for k in keys]
+    return [processed_path(csv_copy(k)) for k in keys]
+
+
+def write_table(path: Path, df: pd.DataFrame | str, *, force: bool, src: Path) -> None:
+    """
+    Write `df` to `path` in the PROCESSED_FORMAT, creating its folder.
+    Without `force` an output already rebuilt from the current `src` is kept;
+    a missing one, or one older than `src`, is (re)written.
+    """
+    path = processed_path(path)
+    if not force and is_fresh(src, path):
+        return
+    ensure_dir(path.parent)
+    write_processed(df, path)
+
+
+def write_partitioned(df: pd.DataFrame, out_dir: Path, by: str, *, force: bool,
+                      src: Path) -> None:
+    """
+    Write `df` as one hive-partitioned Parquet dataset on column `by`
+    (<out_dir>/<by>=<value>/part-0.parquet): every partition comes out of a
+    single Arrow pass, and a reader can load one value with partition pruning.
+    Without `force` the dataset is kept if every partition is already there
+    and no older than `src`.
+    """
+    if not force and all(
+        is_fresh(src, _partition_file(out_dir, by, value))
+        for value in pd.unique(df[by].dropna())
+    ):
+        return
+    ds.write_dataset(
+        pa.Table.from_pandas(df, preserve_index=False),
+        out_dir,
+        format="parquet",
+        partitioning=[by],
+        partitioning_flavor="hive",
+        file_options=ds.ParquetFileFormat().make_write_options(compression="snappy"),
+        existing_data_behavior="delete_matching",
+    )
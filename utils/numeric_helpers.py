@@ -1,5 +1,6 @@
 # utils/numeric_helpers.py
 
+import numpy as np
 import pandas as pd
 
 def coerce_all_numeric(df: pd.DataFrame, exclude_cols: list[str]) -> pd.DataFrame:
@@ -8,6 +9,29 @@ def coerce_all_numeric(df: pd.DataFrame, exclude_cols: list[str]) -> pd.DataFram
     Non-parseable values become NaN.
     Returns the same DataFrame with conversions applied in-place.
     """
-    to_numeric = [c for c in df.columns if c not in exclude_cols]
-    df[to_numeric] = df[to_numeric].apply(pd.to_numeric, errors="coerce")
+    exclude = set(exclude_cols)
+    # numeric/bool columns come back from to_numeric unchanged – only parse the text ones
+    # one walk over df.dtypes – no per-column Series lookup just to read its dtype
+    to_numeric = [
+        c for c, dt in df.dtypes.items()
+        if c not in exclude and not pd.api.types.is_numeric_dtype(dt)
+    ]
+    if to_numeric:
+        df[to_numeric] = df[to_numeric].apply(pd.to_numeric, errors="coerce")
+    return df
+
+
+_INT32 = np.iinfo(np.int32)
+
+def downcast_ints(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store int64 columns as int32 when their values fit (ids, counts, years) –
+    lossless, the written text is unchanged. One fixed width rather than the
+    smallest per file, so every file of a table keeps the same schema.
+    Floats stay float64: float32 would round the stats.
+    """
+    for c in [c for c, dt in df.dtypes.items() if dt == np.int64]:
+        col = df[c]
+        if col.empty or (_INT32.min <= col.min() and col.max() <= _INT32.max):
+            df[c] = col.astype(np.int32)
     return df
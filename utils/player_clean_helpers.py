@@ -21,7 +21,7 @@ import pandas as pd
 ROOT = pathlib.Path(__file__).resolve().parents[2]
 sys.path.append(str(ROOT))
 
-from utils.clean_helpers import normalise_cols
+from utils.clean_helpers import add_season_bounds, normalise_cols, read_raw_csv
 from utils.numeric_helpers import coerce_all_numeric
 
 RAW_ROOT  = ROOT / "data/raw/player_stats/general"
@@ -48,16 +48,6 @@ def _ensure_team(df: pd.DataFrame) -> None:
         df["team"] = df["team_id"].astype(str)
 
 
-def _add_season_bounds(df: pd.DataFrame) -> None:
-    if "season_year" in df.columns:
-        df.rename(columns={"season_year": "season"}, inplace=True)
-
-    if "season" in df.columns:
-        yr = df["season"].astype(str).str.extract(r"^(\d{4})", expand=False)
-        df["season_start"] = pd.to_numeric(yr, errors="coerce")
-        df["season_end"]   = df["season_start"] + 1
-
-
 # ── tiny I/O helper ─────────────────────────────────────────────────────────
 def _write_csv(path: pathlib.Path, df: pd.DataFrame, *, force: bool) -> None:
     if path.exists() and not force:
@@ -75,17 +65,18 @@ def _clean_one(
     force: bool,
 ) -> None:
     """Clean one CSV, write league-wide file + per-team copies."""
-    df = pd.read_csv(src)
+    df = read_raw_csv(src)
     if df.empty:
         print(f"⚠️  {src.name}: empty — skipped")
         return
 
     df.columns = normalise_cols(df.columns)
     _ensure_team(df)
-    _add_season_bounds(df)
+    add_season_bounds(df)
 
-    non_num = set(df.select_dtypes(include=["object", "datetime"]).columns)
-    df = coerce_all_numeric(df, list(non_num))
+    # text (kind "O": object / str) and datetime ("M") columns keep their parsed values
+    non_num = [c for c, dt in df.dtypes.items() if dt.kind in "OM"]
+    df = coerce_all_numeric(df, non_num)
     df.drop_duplicates(inplace=True)
 
     if df.empty: